@@ -2,6 +2,7 @@
 
 import asyncio
 import importlib
+import time
 
 from pyrogram.types import BotCommand
 from pyrogram import idle
@@ -10,27 +11,16 @@ from pytgcalls.exceptions import NoActiveGroupCall
 import config
 from DeadlineTech import LOGGER, app, userbot
 from DeadlineTech.core.call import Anony
+from DeadlineTech.core.snapshot import snapshot
+from DeadlineTech.core.startup import startup
 from DeadlineTech.misc import sudo
 from DeadlineTech.plugins import ALL_MODULES
+from DeadlineTech.utils.cookies import cookie_pool
 from DeadlineTech.utils.database import get_banned_users, get_gbanned
 from DeadlineTech.utils.crash_reporter import setup_global_exception_handler  # ✅ Import crash handler
 from config import BANNED_USERS
 
-async def init():
-    # ✅ Enable global crash handler
-    setup_global_exception_handler()
-
-  
-    if (
-        not config.STRING1
-        and not config.STRING2
-        and not config.STRING3
-        and not config.STRING4
-        and not config.STRING5
-    ):
-        LOGGER(__name__).error("Assistant client variables not defined, exiting...")
-        exit()
-    await sudo()
+async def load_banned():
     try:
         users = await get_gbanned()
         for user_id in users:
@@ -40,7 +30,18 @@ async def init():
             BANNED_USERS.add(user_id)
     except:
         pass
-    await app.start()
+
+
+async def init():
+    # ✅ Enable global crash handler
+    setup_global_exception_handler()
+
+  
+    if not any(config.STRING_SESSIONS.values()):
+        LOGGER(__name__).error("Assistant client variables not defined, exiting...")
+        exit()
+    await startup.phase("bot and database", sudo(), load_banned(), app.start())
+    cookie_pool.start()
 
     await app.set_bot_commands([
         BotCommand("start", "Sᴛᴀʀᴛ's Tʜᴇ Bᴏᴛ"),
@@ -72,11 +73,17 @@ async def init():
     ])
 
     
+    start = time.monotonic()
     for all_module in ALL_MODULES:
         importlib.import_module("DeadlineTech.plugins" + all_module)
+    startup.timings["plugins"] = time.monotonic() - start
     LOGGER("DeadlineTech.plugins").info("Successfully Imported Modules...")
-    await userbot.start()
-    await Anony.start()
+    await Anony.decorators()
+    (ready,) = await startup.phase("first assistant", startup.start_assistants(userbot, Anony))
+    if not ready:
+        LOGGER("DeadlineTech").error("No assistant could be started, exiting...")
+        exit()
+    startup.start_services(Anony.calls)
     try:
         await Anony.stream_call("https://te.legra.ph/file/29f784eb49d230ab62e9e.mp4")
     except NoActiveGroupCall:
@@ -86,11 +93,15 @@ async def init():
         exit()
     except:
         pass
-    await Anony.decorators()
+    snapshot.start()
     LOGGER("DeadlineTech").info(
         "DeadlineTech Music Bot started successfully"
     )
+    LOGGER("DeadlineTech").info(
+        "Startup timings: " + ", ".join(f"{k} {v:.2f}s" for k, v in startup.timings.items())
+    )
     await idle()
+    LOGGER("DeadlineTech").info(f"Saved {await snapshot.save(final=True)} queues for the next start")
     await app.stop()
     await userbot.stop()
     LOGGER("DeadlineTech").info("Stopping DeadlineTech Music Bot...")
@@ -1,7 +1,7 @@
 import asyncio
 import os
 from datetime import datetime, timedelta
-from typing import Union
+from typing import Dict, Optional, Union
 
 from pyrogram import Client
 from pyrogram.types import InlineKeyboardMarkup
@@ -17,14 +17,19 @@ from pytgcalls.types import (
     VideoQuality,
     Update,
 )
+from pytgcalls.types.raw import Stream
 from pytgcalls.types.stream import StreamAudioEnded
 
 import config
 from DeadlineTech import YouTube, app
+from DeadlineTech.core.health import probe
+from DeadlineTech.core.registry import Registry, cleanup
 from DeadlineTech.misc import db
+from DeadlineTech.utils.assistant_scheduler import scheduler
 from DeadlineTech.utils.database import (
     add_active_chat,
     add_active_video_chat,
+    get_assistant_number,
     get_lang,
     get_loop,
     group_assistant,
@@ -35,87 +40,110 @@ from DeadlineTech.utils.database import (
     set_loop,
 )
 from DeadlineTech.utils.exceptions import AssistantErr
+from DeadlineTech.utils.file_cache import send_cached_photo
 from DeadlineTech.utils.formatters import check_duration, seconds_to_min, speed_converter
 from DeadlineTech.utils.inline.play import stream_markup
+from DeadlineTech.utils.speed_cache import get_variant, note_speed_change, switching
 from DeadlineTech.utils.stream.autoclear import auto_clean
+from DeadlineTech.utils.stream.lifecycle import lifecycle
+from DeadlineTech.utils.stream.relay import relay
 from DeadlineTech.utils.thumbnails import get_thumb
 from strings import get_string
 
+from ..logging import LOGGER
+
 # Global default qualities
 DEFAULT_AUDIO_QUALITY = AudioQuality.HIGH
 DEFAULT_VIDEO_QUALITY = VideoQuality.SD_480p
 ELSE_AUDIO_QUALITY = AudioQuality.STUDIO
 
-autoend = {}
-counter = {}
-db_locks = {}  # Added for thread-safe queue operations
+autoend = Registry("autoend", config.STATE_TTL, per_chat=True)
+counter = Registry("counter", config.STATE_TTL, per_chat=True)
+db_locks = Registry("db_locks", config.STATE_TTL)  # Added for thread-safe queue operations
+prearmed = {}  # chat_id -> (queue entry, probed stream) ready for the next switch
+arming = {}
+prearm_timers = {}
 loop = asyncio.get_event_loop_policy().get_event_loop()
 
+
+def speed_filters(speed) -> str:
+    """Per-stream ffmpeg filters playing the source at ``speed`` (empty at normal speed)."""
+    if not speed or float(speed) == 1.0:
+        return ""
+    return (
+        f" --audio -atmid -filter:a atempo={speed}"
+        f" --video -atmid -filter:v setpts={1 / float(speed):.4f}*PTS"
+    )
+
+
+def _build_stream(source, video: bool) -> MediaStream:
+    if video:
+        return MediaStream(
+            source,
+            audio_parameters=DEFAULT_AUDIO_QUALITY,
+            video_parameters=DEFAULT_VIDEO_QUALITY,
+        )
+    return MediaStream(
+        source,
+        audio_parameters=ELSE_AUDIO_QUALITY,
+        video_flags=MediaStream.IGNORE,
+    )
+
+
+async def _card_photo(queued, videoid, streamtype):
+    if "index_" in queued:
+        return config.STREAM_IMG_URL
+    if "vid_" not in queued and "live_" not in queued:
+        if videoid == "telegram":
+            return (
+                config.TELEGRAM_AUDIO_URL
+                if str(streamtype) == "audio"
+                else config.TELEGRAM_VIDEO_URL
+            )
+        if videoid == "soundcloud":
+            return config.SOUNCLOUD_IMG_URL
+    return await get_thumb(videoid)
+
+
 async def _clear_(chat_id):
+    prearmed.pop(chat_id, None)
+    if timer := prearm_timers.pop(chat_id, None):
+        timer.cancel()
+    cleanup(chat_id)
     try:
-        if chat_id in db:
-            del db[chat_id]
+        queue = db.pop(chat_id, ())
         await remove_active_video_chat(chat_id)
         await remove_active_chat(chat_id)
+        for entry in queue:
+            await auto_clean(entry)
     except Exception:
         pass
 
 class Call(PyTgCalls):
     def __init__(self):
-        self.userbot1 = Client(
-            name="DeadlineXAss1",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING1),
-        )
-        self.one = PyTgCalls(
-            self.userbot1,
-            cache_duration=100,
-        )
-        self.userbot2 = Client(
-            name="DeadlineXAss2",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING2),
-        )
-        self.two = PyTgCalls(
-            self.userbot2,
-            cache_duration=100,
-        )
-        self.userbot3 = Client(
-            name="DeadlineXAss3",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING3),
-        )
-        self.three = PyTgCalls(
-            self.userbot3,
-            cache_duration=100,
-        )
-        self.userbot4 = Client(
-            name="DeadlineXAss4",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING4),
-        )
-        self.four = PyTgCalls(
-            self.userbot4,
-            cache_duration=100,
-        )
-        self.userbot5 = Client(
-            name="DeadlineXAss5",
-            api_id=config.API_ID,
-            api_hash=config.API_HASH,
-            session_string=str(config.STRING5),
-        )
-        self.five = PyTgCalls(
-            self.userbot5,
-            cache_duration=100,
-        )
+        # assistant number -> PyTgCalls, same numbering as Userbot.clients
+        self.calls: Dict[int, PyTgCalls] = {
+            number: PyTgCalls(
+                Client(
+                    name=f"DeadlineXAss{number}",
+                    api_id=config.API_ID,
+                    api_hash=config.API_HASH,
+                    session_string=str(session),
+                ),
+                cache_duration=100,
+            )
+            for number, session in config.STRING_SESSIONS.items()
+            if session
+        }
+
+    def get(self, number) -> Optional[PyTgCalls]:
+        return self.calls.get(int(number))
 
     async def pause_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
         await assistant.pause_stream(chat_id)
+        if playing := db.get(chat_id):
+            playing[0].clock.pause()
 
     async def mute_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
@@ -133,6 +161,8 @@ class Call(PyTgCalls):
     async def resume_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
         await assistant.resume_stream(chat_id)
+        if playing := db.get(chat_id):
+            playing[0].clock.resume()
 
     async def stop_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
@@ -143,7 +173,7 @@ class Call(PyTgCalls):
             pass
 
     async def stop_stream_force(self, chat_id: int):
-        for client in [self.one, self.two, self.three, self.four, self.five]:
+        for client in self.calls.values():
             try:
                 await client.leave_group_call(chat_id)
             except Exception:
@@ -151,55 +181,76 @@ class Call(PyTgCalls):
         await _clear_(chat_id)
 
     async def speedup_stream(self, chat_id: int, file_path, speed, playing):
+        if config.SPEED_MODE == "realtime":
+            return await self._speedup_realtime(chat_id, file_path, speed, playing)
         assistant = await group_assistant(self, chat_id)
-        if str(speed) != "1.0":
-            base = os.path.basename(file_path)
-            chatdir = os.path.join(os.getcwd(), "playback", str(speed))
-            if not os.path.isdir(chatdir):
-                os.makedirs(chatdir)
-            out = os.path.join(chatdir, base)
-            if not os.path.isfile(out):
-                if str(speed) == "0.5":
-                    vs = 2.0
-                if str(speed) == "0.75":
-                    vs = 1.35
-                if str(speed) == "1.5":
-                    vs = 0.68
-                if str(speed) == "2.0":
-                    vs = 0.5
-                proc = await asyncio.create_subprocess_shell(
-                    cmd=(
-                        "ffmpeg "
-                        "-i "
-                        f"{file_path} "
-                        "-filter:v "
-                        f"setpts={vs}*PTS "
-                        "-filter:a "
-                        f"atempo={speed} "
-                        f"{out}"
-                    ),
-                    stdin=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE,
+        # the variant is only referenced by the queue once the switch is done
+        with switching(file_path, speed):
+            if str(speed) != "1.0":
+                note_speed_change(file_path)
+                out = await get_variant(file_path, speed)
+                if not out:
+                    raise AssistantErr("Failed to render the speed variant")
+            else:
+                out = file_path
+            dur = await loop.run_in_executor(None, check_duration, out)
+            dur = int(dur)
+            played, con_seconds = speed_converter(playing[0]["played"], speed)
+            duration = seconds_to_min(dur)
+            stream = (
+                MediaStream(
+                    out,
+                    audio_parameters=DEFAULT_AUDIO_QUALITY,
+                    video_parameters=DEFAULT_VIDEO_QUALITY,
+                    ffmpeg_parameters=f"-ss {played} -to {duration}",
                 )
-                await proc.communicate()
-        else:
-            out = file_path
-        dur = await loop.run_in_executor(None, check_duration, out)
-        dur = int(dur)
-        played, con_seconds = speed_converter(playing[0]["played"], speed)
-        duration = seconds_to_min(dur)
+                if playing[0]["streamtype"] == "video"
+                else MediaStream(
+                    out,
+                    audio_parameters=ELSE_AUDIO_QUALITY,
+                    ffmpeg_parameters=f"-ss {played} -to {duration}",
+                    video_flags=MediaStream.IGNORE,
+                )
+            )
+            if str(db[chat_id][0]["file"]) == str(file_path):
+                await assistant.change_stream(chat_id, stream)
+            else:
+                raise AssistantErr("Umm")
+            if str(db[chat_id][0]["file"]) == str(file_path):
+                exis = (playing[0]).get("old_dur")
+                if not exis:
+                    db[chat_id][0]["old_dur"] = db[chat_id][0]["dur"]
+                    db[chat_id][0]["old_second"] = db[chat_id][0]["seconds"]
+                db[chat_id][0]["played"] = con_seconds
+                db[chat_id][0]["dur"] = duration
+                db[chat_id][0]["seconds"] = dur
+                db[chat_id][0]["speed_path"] = out
+                db[chat_id][0]["speed"] = speed
+                self.schedule_prearm(chat_id)
+
+    async def _speedup_realtime(self, chat_id: int, file_path, speed, playing):
+        # Filter the original file while streaming: no re-encode, no extra disk.
+        # "played"/"seconds" stay on the sped-up timeline so progress bars keep
+        # working; the clock converts back to the source position.
+        assistant = await group_assistant(self, chat_id)
+        source_seconds = int(playing[0].get("old_second") or playing[0]["seconds"])
+        position = min(int(playing[0].clock.position()), source_seconds)
+        dur = int(source_seconds / float(speed))
+        params = f"-ss {seconds_to_min(position)} -to {seconds_to_min(source_seconds)}"
+        params += speed_filters(speed)
+        source = relay.source(file_path)
         stream = (
             MediaStream(
-                out,
+                source,
                 audio_parameters=DEFAULT_AUDIO_QUALITY,
                 video_parameters=DEFAULT_VIDEO_QUALITY,
-                ffmpeg_parameters=f"-ss {played} -to {duration}",
+                ffmpeg_parameters=params,
             )
             if playing[0]["streamtype"] == "video"
             else MediaStream(
-                out,
+                source,
                 audio_parameters=ELSE_AUDIO_QUALITY,
-                ffmpeg_parameters=f"-ss {played} -to {duration}",
+                ffmpeg_parameters=params,
                 video_flags=MediaStream.IGNORE,
             )
         )
@@ -208,21 +259,23 @@ class Call(PyTgCalls):
         else:
             raise AssistantErr("Umm")
         if str(db[chat_id][0]["file"]) == str(file_path):
-            exis = (playing[0]).get("old_dur")
-            if not exis:
+            if not (playing[0]).get("old_dur"):
                 db[chat_id][0]["old_dur"] = db[chat_id][0]["dur"]
                 db[chat_id][0]["old_second"] = db[chat_id][0]["seconds"]
-            db[chat_id][0]["played"] = con_seconds
-            db[chat_id][0]["dur"] = duration
+            db[chat_id][0]["played"] = int(position / float(speed))
+            db[chat_id][0]["dur"] = seconds_to_min(dur)
             db[chat_id][0]["seconds"] = dur
-            db[chat_id][0]["speed_path"] = out
+            db[chat_id][0]["speed_path"] = None
             db[chat_id][0]["speed"] = speed
+            db[chat_id][0].clock.speed = float(speed)
+            self.schedule_prearm(chat_id)
 
     async def force_stop_stream(self, chat_id: int):
         assistant = await group_assistant(self, chat_id)
         try:
             check = db.get(chat_id)
-            check.pop(0)
+            popped = check.popleft()
+            await auto_clean(popped)
         except:
             pass
         await remove_active_video_chat(chat_id)
@@ -240,6 +293,7 @@ class Call(PyTgCalls):
         image: Union[bool, str] = None,
     ):
         assistant = await group_assistant(self, chat_id)
+        file_path, link = link, relay.source(link)
         if video:
             stream = MediaStream(
                 link,
@@ -255,22 +309,30 @@ class Call(PyTgCalls):
         try:
             await assistant.change_stream(chat_id, stream)
         except Exception:
-            await app.send_message(chat_id, text="Failed to skip stream due to an error.")
+            return await app.send_message(chat_id, text="Failed to skip stream due to an error.")
+        if playing := db.get(chat_id):
+            if "vid_" in playing[0]["file"]:
+                lifecycle.pin(playing[0], file_path)
+            playing[0]["played"] = 0
+            playing[0].clock.speed = float(playing[0].get("speed") or 1.0)
+            self.schedule_prearm(chat_id)
 
-    async def seek_stream(self, chat_id, file_path, to_seek, duration, mode):
+    async def seek_stream(self, chat_id, file_path, to_seek, duration, mode, speed=None):
         assistant = await group_assistant(self, chat_id)
+        file_path = relay.source(file_path)
+        params = f"-ss {to_seek} -to {duration}" + speed_filters(speed)
         stream = (
             MediaStream(
                 file_path,
                 audio_parameters=DEFAULT_AUDIO_QUALITY,
                 video_parameters=DEFAULT_VIDEO_QUALITY,
-                ffmpeg_parameters=f"-ss {to_seek} -to {duration}",
+                ffmpeg_parameters=params,
             )
             if mode == "video"
             else MediaStream(
                 file_path,
                 audio_parameters=ELSE_AUDIO_QUALITY,
-                ffmpeg_parameters=f"-ss {to_seek} -to {duration}",
+                ffmpeg_parameters=params,
                 video_flags=MediaStream.IGNORE,
             )
         )
@@ -295,21 +357,25 @@ class Call(PyTgCalls):
         link,
         video: Union[bool, str] = None,
         image: Union[bool, str] = None,
+        ffmpeg_parameters: Optional[str] = None,
     ):
         assistant = await group_assistant(self, chat_id)
         language = await get_lang(chat_id)
         _ = get_string(language)
+        link = relay.source(link)
         if video:
             stream = MediaStream(
                 link,
                 audio_parameters=DEFAULT_AUDIO_QUALITY,
                 video_parameters=DEFAULT_VIDEO_QUALITY,
+                ffmpeg_parameters=ffmpeg_parameters,
             )
         else:
             stream = MediaStream(
                 link,
                 audio_parameters=ELSE_AUDIO_QUALITY,
                 video_flags=MediaStream.IGNORE,
+                ffmpeg_parameters=ffmpeg_parameters,
             )
         try:
             await assistant.join_group_call(chat_id, stream)
@@ -318,10 +384,12 @@ class Call(PyTgCalls):
         except AlreadyJoinedError:
             raise AssistantErr(_["call_9"])
         except TelegramServerError:
+            scheduler.report_error(await get_assistant_number(chat_id))
             raise AssistantErr(_["call_10"])
         except Exception as e:
             if "phone.CreateGroupCall" in str(e):
                 raise AssistantErr(_["call_8"])
+            scheduler.report_error(await get_assistant_number(chat_id))
             raise AssistantErr("Failed to join voice chat due to an unexpected error.")
         await add_active_chat(chat_id)
         await music_on(chat_id)
@@ -340,6 +408,7 @@ class Call(PyTgCalls):
                 return True
             except Exception:
                 await asyncio.sleep(0)
+        scheduler.report_error(await get_assistant_number(chat_id))
         return False
 
     async def check_autoend(self, chat_id):
@@ -363,7 +432,7 @@ class Call(PyTgCalls):
             loop = await get_loop(chat_id)
             try:
                 if loop == 0:
-                    popped = check.pop(0)
+                    popped = check.popleft()
                 else:
                     loop = loop - 1
                     await set_loop(chat_id, loop)
@@ -377,246 +446,200 @@ class Call(PyTgCalls):
                 await client.leave_group_call(chat_id)
                 return
             else:
-                queued = check[0]["file"]
-                language = await get_lang(chat_id)
-                _ = get_string(language)
-                title = (check[0]["title"]).title()
-                user = check[0]["by"]
-                original_chat_id = check[0]["chat_id"]
-                streamtype = check[0]["streamtype"]
-                videoid = check[0]["vidid"]
+                entry = check[0]
+                queued = entry["file"]
+                videoid = entry["vidid"]
+                video = str(entry["streamtype"]) == "video"
                 db[chat_id][0]["played"] = 0
                 if exis := (check[0]).get("old_dur"):
                     db[chat_id][0]["dur"] = exis
                     db[chat_id][0]["seconds"] = check[0]["old_second"]
                     db[chat_id][0]["speed_path"] = None
                     db[chat_id][0]["speed"] = 1.0
-                video = str(streamtype) == "video"
-                if "live_" in queued:
-                    n, link = await YouTube.video(videoid, True)
-                    if n == 0:
-                        await app.send_message(original_chat_id, text=_["call_6"])
-                        await _clear_(chat_id)
-                        return
-                    if video:
-                        stream = MediaStream(
-                            link,
-                            audio_parameters=DEFAULT_AUDIO_QUALITY,
-                            video_parameters=DEFAULT_VIDEO_QUALITY,
-                        )
-                    else:
-                        stream = MediaStream(
-                            link,
-                            audio_parameters=ELSE_AUDIO_QUALITY,
-                            video_flags=MediaStream.IGNORE,
-                        )
-                    if not await self.attempt_stream(client, chat_id, stream):
-                        await app.send_message(original_chat_id, text=_["call_6"])
-                        await _clear_(chat_id)
-                        return
-                    img = await get_thumb(videoid)
-                    button = stream_markup(_, chat_id)
-                    run = await app.send_photo(
-                        chat_id=original_chat_id,
-                        photo=img,
-                        caption=_["stream_1"].format(
-                            f"https://t.me/{app.username}?start=info_{videoid}",
-                            title[:23],
-                            check[0]["dur"],
-                            user,
-                        ),
-                        reply_markup=InlineKeyboardMarkup(button),
-                    )
-                    db[chat_id][0]["mystic"] = run
-                    db[chat_id][0]["markup"] = "tg"
-                elif "vid_" in queued:
-                    mystic = await app.send_message(original_chat_id, _["call_7"])
-                    try:
-                        file_path, direct = await YouTube.download(
-                            videoid,
-                            mystic,
-                            videoid=True,
-                            video=str(streamtype) == "video",
-                        )
-                        if not os.path.exists(file_path):
-                            await mystic.edit_text(_["call_6"], disable_web_page_preview=True)
-                            await _clear_(chat_id)
-                            return
-                    except Exception:
-                        await mystic.edit_text(_["call_6"], disable_web_page_preview=True)
-                        await _clear_(chat_id)
-                        return
-                    if video:
-                        stream = MediaStream(
-                            file_path,
-                            audio_parameters=DEFAULT_AUDIO_QUALITY,
-                            video_parameters=DEFAULT_VIDEO_QUALITY,
-                        )
-                    else:
-                        stream = MediaStream(
-                            file_path,
-                            audio_parameters=ELSE_AUDIO_QUALITY,
-                            video_flags=MediaStream.IGNORE,
-                        )
-                    if not await self.attempt_stream(client, chat_id, stream):
-                        await app.send_message(original_chat_id, text=_["call_6"])
-                        await _clear_(chat_id)
-                        return
-                    img = await get_thumb(videoid)
-                    button = stream_markup(_, chat_id)
-                    await mystic.delete()
-                    run = await app.send_photo(
-                        chat_id=original_chat_id,
-                        photo=img,
-                        caption=_["stream_1"].format(
-                            f"https://t.me/{app.username}?start=info_{videoid}",
-                            title[:23],
-                            check[0]["dur"],
-                            user,
-                        ),
-                        reply_markup=InlineKeyboardMarkup(button),
-                    )
-                    db[chat_id][0]["mystic"] = run
-                    db[chat_id][0]["markup"] = "stream"
-                elif "index_" in queued:
-                    stream = (
-                        MediaStream(
-                            videoid,
-                            audio_parameters=DEFAULT_AUDIO_QUALITY,
-                            video_parameters=DEFAULT_VIDEO_QUALITY,
-                        )
-                        if str(streamtype) == "video"
-                        else MediaStream(
-                            videoid,
-                            audio_parameters=ELSE_AUDIO_QUALITY,
-                            video_flags=MediaStream.IGNORE,
-                        )
-                    )
-                    if not await self.attempt_stream(client, chat_id, stream):
-                        await app.send_message(original_chat_id, text=_["call_6"])
-                        await _clear_(chat_id)
-                        return
-                    button = stream_markup(_, chat_id)
-                    run = await app.send_photo(
-                        chat_id=original_chat_id,
-                        photo=config.STREAM_IMG_URL,
-                        caption=_["stream_2"].format(user),
-                        reply_markup=InlineKeyboardMarkup(button),
-                    )
-                    db[chat_id][0]["mystic"] = run
-                    db[chat_id][0]["markup"] = "tg"
+                entry.clock.speed = 1.0
+                # language and the now-playing photo are prepared while the media resolves
+                lang = asyncio.create_task(get_lang(chat_id))
+                photo = asyncio.create_task(_card_photo(queued, videoid, entry["streamtype"]))
+                armed = prearmed.pop(chat_id, None)
+                if armed and armed[0] is entry:
+                    stream, mystic = armed[1], None
                 else:
-                    if video:
-                        stream = MediaStream(
-                            queued,
-                            audio_parameters=DEFAULT_AUDIO_QUALITY,
-                            video_parameters=DEFAULT_VIDEO_QUALITY,
-                        )
-                    else:
-                        stream = MediaStream(
-                            queued,
-                            audio_parameters=ELSE_AUDIO_QUALITY,
-                            video_flags=MediaStream.IGNORE,
-                        )
-                    if not await self.attempt_stream(client, chat_id, stream):
-                        await app.send_message(original_chat_id, text=_["call_6"])
-                        await _clear_(chat_id)
-                        return
-                    if videoid == "telegram":
-                        button = stream_markup(_, chat_id)
-                        run = await app.send_photo(
-                            chat_id=original_chat_id,
-                            photo=(
-                                config.TELEGRAM_AUDIO_URL
-                                if str(streamtype) == "audio"
-                                else config.TELEGRAM_VIDEO_URL
-                            ),
-                            caption=_["stream_1"].format(
-                                config.SUPPORT_CHAT, title[:23], check[0]["dur"], user
-                            ),
-                            reply_markup=InlineKeyboardMarkup(button),
-                        )
-                        db[chat_id][0]["mystic"] = run
-                        db[chat_id][0]["markup"] = "tg"
-                    elif videoid == "soundcloud":
-                        button = stream_markup(_, chat_id)
-                        run = await app.send_photo(
-                            chat_id=original_chat_id,
-                            photo=config.SOUNCLOUD_IMG_URL,
-                            caption=_["stream_1"].format(
-                                config.SUPPORT_CHAT, title[:23], check[0]["dur"], user
-                            ),
-                            reply_markup=InlineKeyboardMarkup(button),
-                        )
-                        db[chat_id][0]["mystic"] = run
-                        db[chat_id][0]["markup"] = "tg"
-                    else:
-                        img = await get_thumb(videoid)
-                        button = stream_markup(_, chat_id)
-                        run = await app.send_photo(
-                            chat_id=original_chat_id,
-                            photo=img,
-                            caption=_["stream_1"].format(
-                                f"https://t.me/{app.username}?start=info_{videoid}",
-                                title[:23],
-                                check[0]["dur"],
-                                user,
-                            ),
-                            reply_markup=InlineKeyboardMarkup(button),
-                        )
-                        db[chat_id][0]["mystic"] = run
-                        db[chat_id][0]["markup"] = "stream"
+                    source, mystic = await self._resolve_media(chat_id, entry, lang)
+                    stream = _build_stream(source, video) if source else None
+                if stream and await self.attempt_stream(client, chat_id, stream):
+                    entry["played"] = 0
+                    self.schedule_prearm(chat_id)
+                    asyncio.create_task(self._announce(chat_id, entry, lang, photo, mystic))
+                    return
+                photo.cancel()
+                _ = get_string(await lang)
+                if mystic:
+                    await mystic.edit_text(_["call_6"], disable_web_page_preview=True)
+                else:
+                    await app.send_message(entry["chat_id"], text=_["call_6"])
+                await _clear_(chat_id)
+
+    def track_started(self, chat_id, played: int = 0):
+        """Start the clock of the head entry at ``played`` and arm its pre-arm timer.
+
+        Called once the entry is both queued and streaming: ``join_call`` runs before
+        the first track of a session is put in the queue.
+        """
+        if playing := db.get(chat_id):
+            playing[0]["played"] = played
+            self.schedule_prearm(chat_id)
+
+    def schedule_prearm(self, chat_id):
+        """Arm a timer that pre-arms the next stream PREARM_SECONDS before this track ends."""
+        if timer := prearm_timers.pop(chat_id, None):
+            timer.cancel()
+        playing = db.get(chat_id)
+        if not config.GAPLESS_MODE or not playing or not playing[0]["seconds"]:
+            return
+        remaining = int(playing[0]["seconds"]) - playing[0]["played"]
+        prearm_timers[chat_id] = asyncio.get_running_loop().call_later(
+            max(remaining - config.PREARM_SECONDS, 0), self._prearm_due, chat_id
+        )
+
+    def _prearm_due(self, chat_id):
+        prearm_timers.pop(chat_id, None)
+        playing = db.get(chat_id)
+        if not playing:
+            return
+        remaining = int(playing[0]["seconds"]) - playing[0]["played"]
+        if remaining > config.PREARM_SECONDS + 1:
+            # paused or seeked back since the timer was set
+            return self.schedule_prearm(chat_id)
+        self.prearm(chat_id)
+
+    def prearm(self, chat_id):
+        """Prepare the next queue entry's stream so the switch at the end of this track is gapless."""
+        if not config.GAPLESS_MODE or chat_id in arming:
+            return
+        task = asyncio.create_task(self._prearm(chat_id))
+        arming[chat_id] = task
+        task.add_done_callback(lambda _t: arming.pop(chat_id, None))
+
+    async def _prearm(self, chat_id):
+        playing = db.get(chat_id)
+        if not playing:
+            return
+        if await get_loop(chat_id):
+            entry = playing[0]
+        elif len(playing) > 1:
+            entry = playing[1]
+        else:
+            return
+        armed = prearmed.get(chat_id)
+        if armed and armed[0] is entry:
+            return
+        queued = entry["file"]
+        if "live_" in queued or "index_" in queued:
+            return
+        video = str(entry["streamtype"]) == "video"
+        try:
+            if "vid_" in queued:
+                # without a mystic the download is silent; change_stream falls back to it if this fails
+                file_path, _direct = await YouTube.download(
+                    entry["vidid"], None, videoid=True, video=video
+                )
+                lifecycle.pin(entry, file_path)
+            else:
+                file_path = queued
+            # only files fully on disk: relay sources are tied to an in-progress download
+            if not file_path or not os.path.exists(file_path) or relay.source(file_path) != file_path:
+                return
+            media = _build_stream(file_path, video)
+            await media.check_stream()
+            asyncio.create_task(_card_photo(queued, entry["vidid"], entry["streamtype"]))
+        except Exception as e:
+            LOGGER(__name__).info(f"Could not pre-arm the next stream in {chat_id}: {e}")
+            return
+        # a probed raw Stream is not probed again by change_stream
+        prearmed[chat_id] = (entry, Stream(media.stream_audio, media.stream_video))
+
+    async def _resolve_media(self, chat_id, entry, lang):
+        """Return ``(source, mystic)`` for the next queue entry, ``source`` is None on failure."""
+        queued = entry["file"]
+        videoid = entry["vidid"]
+        if "live_" in queued:
+            n, link = await YouTube.video(videoid, True)
+            return (link if n else None), None
+        if "vid_" in queued:
+            _ = get_string(await lang)
+            mystic = await app.send_message(entry["chat_id"], _["call_7"])
+            try:
+                file_path, direct = await YouTube.download(
+                    videoid,
+                    mystic,
+                    videoid=True,
+                    video=str(entry["streamtype"]) == "video",
+                )
+            except Exception:
+                return None, mystic
+            if not file_path or not os.path.exists(file_path):
+                return None, mystic
+            lifecycle.pin(entry, file_path)
+            return file_path, mystic
+        if "index_" in queued:
+            return videoid, None
+        return relay.source(queued), None
+
+    async def _announce(self, chat_id, entry, lang, photo, mystic):
+        # Sent after the switch so a slow thumbnail render never delays playback
+        try:
+            _ = get_string(await lang)
+            img = await photo
+            if mystic:
+                try:
+                    await mystic.delete()
+                except Exception:
+                    pass
+            playing = db.get(chat_id)
+            if not playing or playing[0] is not entry:
+                return
+            queued, videoid, user = entry["file"], entry["vidid"], entry["by"]
+            title = (entry["title"]).title()
+            if "index_" in queued:
+                caption, markup = _["stream_2"].format(user), "tg"
+            elif videoid in ("telegram", "soundcloud") and "vid_" not in queued and "live_" not in queued:
+                caption = _["stream_1"].format(config.SUPPORT_CHAT, title[:23], entry["dur"], user)
+                markup = "tg"
+            else:
+                caption = _["stream_1"].format(
+                    f"https://t.me/{app.username}?start=info_{videoid}",
+                    title[:23],
+                    entry["dur"],
+                    user,
+                )
+                markup = "tg" if "live_" in queued else "stream"
+            run = await send_cached_photo(
+                app.send_photo,
+                chat_id=entry["chat_id"],
+                photo=img,
+                caption=caption,
+                reply_markup=InlineKeyboardMarkup(stream_markup(_, chat_id)),
+            )
+            entry["mystic"] = run
+            entry["markup"] = markup
+        except Exception as e:
+            LOGGER(__name__).warning(f"Failed to send now playing for {chat_id}: {e}")
 
     async def ping(self):
-        pings = []
-        if config.STRING1:
-            pings.append(await self.one.ping)
-        if config.STRING2:
-            pings.append(await self.two.ping)
-        if config.STRING3:
-            pings.append(await self.three.ping)
-        if config.STRING4:
-            pings.append(await self.four.ping)
-        if config.STRING5:
-            pings.append(await self.five.ping)
-        return str(round(sum(pings) / len(pings), 3))
-
-    async def start(self):
-        if config.STRING1:
-            await self.one.start()
-        if config.STRING2:
-            await self.two.start()
-        if config.STRING3:
-            await self.three.start()
-        if config.STRING4:
-            await self.four.start()
-        if config.STRING5:
-            await self.five.start()
+        latency = probe.average()
+        if latency is None:
+            # nothing recorded yet, probe everyone once
+            await probe.probe(self.calls)
+            latency = probe.average() or 0
+        return str(round(latency, 3))
+
+    async def start_assistant(self, number: int):
+        await self.calls[number].start()
 
     async def decorators(self):
-        @self.one.on_kicked()
-        @self.two.on_kicked()
-        @self.three.on_kicked()
-        @self.four.on_kicked()
-        @self.five.on_kicked()
-        @self.one.on_closed_voice_chat()
-        @self.two.on_closed_voice_chat()
-        @self.three.on_closed_voice_chat()
-        @self.four.on_closed_voice_chat()
-        @self.five.on_closed_voice_chat()
-        @self.one.on_left()
-        @self.two.on_left()
-        @self.three.on_left()
-        @self.four.on_left()
-        @self.five.on_left()
         async def stream_services_handler(_, chat_id: int):
             await self.stop_stream(chat_id)
 
-        @self.one.on_stream_end()
-        @self.two.on_stream_end()
-        @self.three.on_stream_end()
-        @self.four.on_stream_end()
-        @self.five.on_stream_end()
         async def stream_end_handler(client, update: Update):
             if not isinstance(update, StreamAudioEnded):
                 return
@@ -626,4 +649,10 @@ class Call(PyTgCalls):
                 await _clear_(chat_id)
                 await client.leave_group_call(chat_id)
 
+        for call in self.calls.values():
+            call.on_kicked()(stream_services_handler)
+            call.on_closed_voice_chat()(stream_services_handler)
+            call.on_left()(stream_services_handler)
+            call.on_stream_end()(stream_end_handler)
+
 Anony = Call()
@@ -0,0 +1,61 @@
+import asyncio
+from collections import deque
+from typing import Deque, Dict, Optional
+
+import config
+
+from ..logging import LOGGER
+
+
+class HealthProbe:
+    """Pings every assistant's PyTgCalls concurrently and keeps a rolling latency history.
+
+    Readers (``/ping``, the assistant scheduler) use the history instead of waiting on
+    live round-trips. A failed or timed out ping is recorded as ``None``.
+    """
+
+    def __init__(self):
+        self.history: Dict[int, Deque[Optional[float]]] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def _probe_one(self, number: int, call):
+        try:
+            latency = await asyncio.wait_for(call.ping, config.PING_TIMEOUT)
+        except Exception as e:
+            latency = None
+            LOGGER(__name__).warning(f"Assistant {number} ping failed: {type(e).__name__}")
+        self.history.setdefault(number, deque(maxlen=config.PING_HISTORY)).append(latency)
+
+    async def probe(self, calls):
+        from DeadlineTech.core.userbot import assistants
+
+        await asyncio.gather(
+            *(self._probe_one(number, calls[number]) for number in assistants if number in calls)
+        )
+
+    def latency(self, number: int) -> Optional[float]:
+        samples = [s for s in self.history.get(number, ()) if s is not None]
+        return sum(samples) / len(samples) if samples else None
+
+    def is_down(self, number: int) -> bool:
+        recent = list(self.history.get(number, ()))[-config.PING_DOWN_AFTER:]
+        return len(recent) == config.PING_DOWN_AFTER and all(s is None for s in recent)
+
+    def average(self) -> Optional[float]:
+        latencies = [l for l in map(self.latency, self.history) if l is not None]
+        return sum(latencies) / len(latencies) if latencies else None
+
+    async def _run(self, calls):
+        while True:
+            try:
+                await self.probe(calls)
+            except Exception as e:
+                LOGGER(__name__).warning(f"Health probe failed: {e}")
+            await asyncio.sleep(config.PING_INTERVAL)
+
+    def start(self, calls):
+        if not self._task:
+            self._task = asyncio.create_task(self._run(calls))
+
+
+probe = HealthProbe()
@@ -0,0 +1,148 @@
+import time
+from collections import deque
+from typing import Any, Iterable, Optional
+
+
+class PositionClock:
+    """Playback position of the current track, computed on read from a monotonic anchor.
+
+    ``elapsed`` is wall-clock play time since the track (re)started at ``offset``
+    seconds, excluding pauses. ``speed`` converts it back to a position in the
+    source file.
+    """
+
+    __slots__ = ("offset", "started", "paused_at", "paused_total", "speed")
+
+    def __init__(self, offset: float = 0):
+        self.speed = 1.0
+        self.start(offset)
+
+    def start(self, offset: float = 0):
+        self.offset = offset
+        self.started = time.monotonic()
+        self.paused_at = None
+        self.paused_total = 0.0
+
+    def pause(self):
+        if self.paused_at is None:
+            self.paused_at = time.monotonic()
+
+    def resume(self):
+        if self.paused_at is not None:
+            self.paused_total += time.monotonic() - self.paused_at
+            self.paused_at = None
+
+    @property
+    def paused(self) -> bool:
+        return self.paused_at is not None
+
+    def elapsed(self) -> float:
+        end = self.paused_at if self.paused_at is not None else time.monotonic()
+        return self.offset + end - self.started - self.paused_total
+
+    def position(self) -> float:
+        return self.elapsed() * self.speed
+
+
+class QueueEntry:
+    """One queued track.
+
+    Slotted to keep long playlists small; item access (``entry["played"]``,
+    ``entry.get("speed_path")``) is kept so code written against the old
+    dict entries works unchanged.
+    """
+
+    __slots__ = (
+        "title",
+        "dur",
+        "streamtype",
+        "by",
+        "user_id",
+        "chat_id",
+        "file",
+        "vidid",
+        "seconds",
+        "clock",
+        "mystic",
+        "markup",
+        "old_dur",
+        "old_second",
+        "speed_path",
+        "speed",
+        "resolved",
+    )
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, None)
+        self.clock = PositionClock()
+        for name, value in fields.items():
+            self[name] = value
+
+    @property
+    def played(self) -> int:
+        """Seconds played, read off the clock; assigning it (seek, track start) restarts the clock there."""
+        played = int(self.clock.elapsed())
+        if self.seconds:
+            played = min(played, int(self.seconds))
+        return max(played, 0)
+
+    @played.setter
+    def played(self, seconds):
+        paused = self.clock.paused
+        self.clock.start(seconds)
+        if paused:
+            self.clock.pause()
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: str, value: Any):
+        try:
+            setattr(self, key, value)
+        except (AttributeError, TypeError):
+            raise KeyError(key) from None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._fields and getattr(self, key) is not None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key, None) if key in self._fields else None
+        return default if value is None else value
+
+    def keys(self):
+        return [name for name in self._fields if getattr(self, name) is not None]
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.keys()}
+
+    def __repr__(self):
+        return f"QueueEntry({self.title!r}, file={self.file!r})"
+
+
+QueueEntry._fields = tuple(n for n in QueueEntry.__slots__ if n != "clock") + ("played",)
+
+
+class ChatQueue(deque):
+    """Per-chat queue; the head pop the player does on every track change is O(1)."""
+
+    def pop(self, index: Optional[int] = None):
+        if index == 0:
+            return self.popleft()
+        if index is None or index == -1 or index == len(self) - 1:
+            return super().pop()
+        item = self[index]
+        del self[index]
+        return item
+
+
+class QueueStore(dict):
+    """``misc.db``: chat_id -> ChatQueue. Lists assigned to it (``db[chat_id] = []``) are converted."""
+
+    def __setitem__(self, chat_id, queue: Iterable):
+        if not isinstance(queue, ChatQueue):
+            queue = ChatQueue(queue)
+        super().__setitem__(chat_id, queue)
@@ -0,0 +1,146 @@
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from ..logging import LOGGER
+
+SWEEP_INTERVAL = 600
+
+registries: List["Registry"] = []
+_teardown: List[Callable[[int], Any]] = []
+_sweeper: Optional[asyncio.Task] = None
+
+
+class Registry(dict):
+    """A dict for runtime state that forgets what it has not used in a while.
+
+    Keys not read or written for ``ttl`` seconds expire, the least recently used
+    keys are evicted past ``maxsize``, and with ``per_chat`` the keys are chat ids
+    dropped by :func:`cleanup` once the chat's stream ends. ``on_evict(key, value)``
+    runs for every key dropped that way.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: Optional[float] = None,
+        maxsize: Optional[int] = None,
+        per_chat: bool = False,
+        on_evict: Optional[Callable[[Any, Any], Any]] = None,
+    ):
+        super().__init__()
+        self.name = name
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.per_chat = per_chat
+        self.on_evict = on_evict
+        # key -> last use, least recently used first
+        self._used: Dict[Any, float] = {}
+        registries.append(self)
+
+    def _touch(self, key):
+        self._used.pop(key, None)
+        self._used[key] = time.monotonic()
+
+    def _expired(self, key) -> bool:
+        return self.ttl is not None and time.monotonic() - self._used.get(key, 0) > self.ttl
+
+    def _evict(self, key):
+        value = super().pop(key)
+        self._used.pop(key, None)
+        if self.on_evict:
+            try:
+                self.on_evict(key, value)
+            except Exception as e:
+                LOGGER(__name__).warning(f"Evicting {key} from {self.name} failed: {e}")
+
+    def __contains__(self, key) -> bool:
+        if not super().__contains__(key):
+            return False
+        if self._expired(key):
+            self._evict(key)
+            return False
+        return True
+
+    def __getitem__(self, key):
+        if key not in self:
+            raise KeyError(key)
+        self._touch(key)
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._touch(key)
+        if self.maxsize:
+            while len(self) > self.maxsize:
+                self._evict(next(iter(self._used)))
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._used.pop(key, None)
+
+    def pop(self, key, *default):
+        self._used.pop(key, None)
+        return super().pop(key, *default)
+
+    def clear(self):
+        super().clear()
+        self._used.clear()
+
+    def forget(self, key):
+        if super().__contains__(key):
+            self._evict(key)
+
+    def sweep(self):
+        if self.ttl is None:
+            return
+        horizon = time.monotonic() - self.ttl
+        expired = []
+        for key, used in self._used.items():
+            if used >= horizon:
+                break
+            expired.append(key)
+        for key in expired:
+            self._evict(key)
+
+
+def on_cleanup(func: Callable[[int], Any]):
+    """Register ``func(chat_id)`` to run from :func:`cleanup`."""
+    _teardown.append(func)
+    return func
+
+
+def cleanup(chat_id: int):
+    """Drop everything kept for ``chat_id`` once its stream has ended."""
+    for registry in registries:
+        if registry.per_chat:
+            registry.forget(chat_id)
+    for func in _teardown:
+        try:
+            func(chat_id)
+        except Exception as e:
+            LOGGER(__name__).warning(f"Cleanup of {chat_id} failed in {func.__qualname__}: {e}")
+
+
+async def _sweep():
+    while True:
+        await asyncio.sleep(SWEEP_INTERVAL)
+        for registry in registries:
+            registry.sweep()
+
+
+def start_sweeper():
+    global _sweeper
+    if not _sweeper:
+        _sweeper = asyncio.create_task(_sweep())
@@ -0,0 +1,179 @@
+import asyncio
+import json
+import os
+import time
+from typing import Dict, Optional
+
+import config
+from DeadlineTech.core.call import Anony, _card_photo, _clear_, speed_filters
+from DeadlineTech.core.queue import ChatQueue, QueueEntry
+from DeadlineTech.misc import db
+from DeadlineTech.utils.database import (
+    get_lang,
+    get_loop,
+    is_active_chat,
+    is_active_video_chat,
+    is_music_playing,
+    music_off,
+    set_loop,
+)
+from DeadlineTech.utils.stream.lifecycle import lifecycle
+
+from ..logging import LOGGER
+
+# everything but the Telegram messages attached to an entry and the download a vid_ entry pinned
+FIELDS = tuple(f for f in QueueEntry._fields if f not in ("mystic", "markup", "resolved"))
+
+
+def _seek(entry) -> Optional[str]:
+    """ffmpeg parameters resuming ``entry`` at its saved position, None to start from the top."""
+    played, seconds = int(entry["played"]), int(entry["seconds"] or 0)
+    if not played or not seconds or "live_" in entry["file"] or "index_" in entry["file"]:
+        return None
+    if entry.get("speed_path"):
+        return f"-ss {played} -to {seconds}"
+    # realtime speed: "played" is on the sped-up timeline, ffmpeg seeks the source
+    speed = float(entry.get("speed") or 1.0)
+    source_seconds = int(entry.get("old_second") or seconds)
+    return f"-ss {int(played * speed)} -to {source_seconds}" + speed_filters(speed)
+
+
+class QueueSnapshot:
+    """Saves every playing chat's queue and player state to disk and brings it back after a restart.
+
+    A snapshot is written every ``SNAPSHOT_INTERVAL`` seconds and on shutdown. On
+    startup, chats from a snapshot younger than ``RESTORE_MAX_AGE`` are rejoined at
+    their saved position, ``RESTORE_CONCURRENCY`` at a time.
+    """
+
+    def __init__(self, path: str = config.SNAPSHOT_PATH):
+        self.path = path
+        self._saved_empty = False
+        self._final = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def capture(self) -> Dict:
+        chats = {}
+        for chat_id, queue in list(db.items()):
+            if not queue or not await is_active_chat(chat_id):
+                continue
+            chats[str(chat_id)] = {
+                "queue": [{f: e.get(f) for f in FIELDS if e.get(f) is not None} for e in queue],
+                "video": await is_active_video_chat(chat_id),
+                "paused": not await is_music_playing(chat_id),
+                "loop": await get_loop(chat_id),
+            }
+        return {"saved": time.time(), "chats": chats}
+
+    async def save(self, final: bool = False) -> int:
+        """Write a snapshot; after a ``final`` one the file is left alone until the process exits."""
+        if self._final:
+            return 0
+        self._final = final
+        data = await self.capture()
+        if not data["chats"] and self._saved_empty:
+            return 0
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            LOGGER(__name__).warning(f"Failed to save queue snapshot: {e}")
+            return 0
+        self._saved_empty = not data["chats"]
+        return len(data["chats"])
+
+    def _load(self) -> Optional[Dict]:
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    async def restore(self):
+        data = self._load()
+        if not config.RESTORE_QUEUES or not data:
+            return
+        age = time.time() - data.get("saved", 0)
+        if age > config.RESTORE_MAX_AGE:
+            LOGGER(__name__).info(f"Queue snapshot is {int(age)}s old, not restoring it")
+            return
+        chats = data.get("chats", {})
+        limit = asyncio.Semaphore(config.RESTORE_CONCURRENCY)
+        results = await asyncio.gather(
+            *(self._restore_chat(int(chat_id), state, limit) for chat_id, state in chats.items())
+        )
+        LOGGER(__name__).info(f"Restored {sum(results)}/{len(results)} queues from the last snapshot")
+
+    async def _restore_chat(self, chat_id: int, state: Dict, limit: asyncio.Semaphore) -> bool:
+        entries = [QueueEntry(**fields) for fields in state.get("queue", ())]
+        # downloads that did not survive the restart are dropped; virtual sources resolve again
+        queue = ChatQueue(
+            e for e in entries if lifecycle.kind(e["file"]) == "virtual" or os.path.exists(e["file"])
+        )
+        if not queue or chat_id in db:
+            return False
+        entry = queue[0]
+        if entry.get("speed_path") and not os.path.exists(entry["speed_path"]):
+            # the sped-up render is gone: fall back to the original file at normal speed
+            entry["played"] = int(entry["played"] * float(entry.get("speed") or 1.0))
+            entry["seconds"] = entry.get("old_second") or entry["seconds"]
+            entry["dur"] = entry.get("old_dur") or entry["dur"]
+            entry["speed_path"] = None
+            entry["speed"] = 1.0
+        if not entry.get("speed_path"):
+            entry.clock.speed = float(entry.get("speed") or 1.0)
+        async with limit:
+            db[chat_id] = queue
+            for e in queue:
+                lifecycle.acquire(e["file"])
+            await set_loop(chat_id, state.get("loop", 0))
+            lang = asyncio.ensure_future(get_lang(chat_id))
+            mystic = None
+            try:
+                source, mystic = await Anony._resolve_media(chat_id, entry, lang)
+                if not source:
+                    raise ValueError(f"could not resolve {entry['file']}")
+                played = int(entry["played"])
+                await Anony.join_call(
+                    chat_id,
+                    entry["chat_id"],
+                    entry.get("speed_path") or source,
+                    video=state.get("video"),
+                    ffmpeg_parameters=_seek(entry),
+                )
+                Anony.track_started(chat_id, played)
+            except Exception as e:
+                LOGGER(__name__).warning(f"Could not restore the queue of {chat_id}: {e}")
+                if mystic:
+                    try:
+                        await mystic.delete()
+                    except Exception:
+                        pass
+                await _clear_(chat_id)
+                return False
+        if state.get("paused"):
+            await Anony.pause_stream(chat_id)
+            await music_off(chat_id)
+        photo = asyncio.create_task(_card_photo(entry["file"], entry["vidid"], entry["streamtype"]))
+        asyncio.create_task(Anony._announce(chat_id, entry, lang, photo, mystic))
+        return True
+
+    async def _run(self):
+        await self.restore()
+        while True:
+            await asyncio.sleep(config.SNAPSHOT_INTERVAL)
+            try:
+                await self.save()
+            except Exception as e:
+                LOGGER(__name__).warning(f"Queue snapshot failed: {e}")
+
+    def start(self):
+        """Restore the last snapshot in the background, then keep taking new ones."""
+        if not self._task:
+            self._task = asyncio.create_task(self._run())
+
+
+snapshot = QueueSnapshot()
@@ -0,0 +1,91 @@
+import asyncio
+import time
+from typing import Dict, List
+
+import config
+
+from ..logging import LOGGER
+
+
+class Startup:
+    """Runs the startup phases, timing each, and knows when the bot can take traffic."""
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+        self.started = time.monotonic()
+        # set once at least one assistant is online
+        self.ready = asyncio.Event()
+        self._pending: List[asyncio.Task] = []
+
+    async def phase(self, name: str, *aws):
+        """Await ``aws`` concurrently as one named phase and log how long it took."""
+        start = time.monotonic()
+        try:
+            return await asyncio.gather(*aws)
+        finally:
+            self.timings[name] = time.monotonic() - start
+            LOGGER(__name__).info(f"Startup phase '{name}' took {self.timings[name]:.2f}s")
+
+    async def _start_assistant(self, number: int, userbot, calls) -> bool:
+        from DeadlineTech.core.userbot import assistants
+
+        start = time.monotonic()
+        try:
+            ok, _ = await asyncio.wait_for(
+                asyncio.gather(userbot.start_assistant(number), calls.start_assistant(number)),
+                config.ASSISTANT_START_TIMEOUT,
+            )
+        except asyncio.TimeoutError:
+            LOGGER(__name__).error(
+                f"Assistant {number} did not come online within {config.ASSISTANT_START_TIMEOUT}s, skipping it"
+            )
+            return False
+        except Exception as e:
+            LOGGER(__name__).error(f"Assistant {number} failed to start calls: {type(e).__name__}: {e}")
+            return False
+        self.timings[f"assistant {number}"] = time.monotonic() - start
+        if not ok:
+            return False
+        assistants.append(number)
+        if not self.ready.is_set():
+            self.ready.set()
+            LOGGER(__name__).info(
+                f"Assistant {number} is online, ready for traffic after {time.monotonic() - self.started:.2f}s"
+            )
+        return True
+
+    async def start_assistants(self, userbot, calls) -> bool:
+        """Start every assistant in parallel, returning once the first is up (False if none).
+
+        The others keep starting in the background and join the pool as they come online.
+        """
+        start = time.monotonic()
+        self._pending = [
+            asyncio.create_task(self._start_assistant(number, userbot, calls))
+            for number in userbot.clients
+        ]
+        for done in asyncio.as_completed(self._pending):
+            if await done:
+                break
+        asyncio.create_task(self._report(start))
+        return self.ready.is_set()
+
+    def start_services(self, calls):
+        """Start the background loops that need the clients running."""
+        from DeadlineTech.core.health import probe
+        from DeadlineTech.core.registry import start_sweeper
+        from DeadlineTech.utils.player_updates import player_updates
+
+        probe.start(calls)
+        start_sweeper()
+        player_updates.start()
+
+    async def _report(self, start: float):
+        results = await asyncio.gather(*self._pending)
+        self.timings["assistants"] = time.monotonic() - start
+        LOGGER(__name__).info(
+            f"{sum(results)}/{len(results)} assistants online after {self.timings['assistants']:.2f}s"
+        )
+
+
+startup = Startup()
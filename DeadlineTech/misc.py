@@ -6,11 +6,18 @@ from pyrogram import filters
 
 import config
 from DeadlineTech.core.mongo import mongodb
+from DeadlineTech.core.queue import QueueStore
+from DeadlineTech.core.registry import Registry
 
 from .logging import LOGGER
 
 SUDOERS = filters.user()
 
+adminlist = Registry("adminlist", config.STATE_TTL, config.STATE_MAX_CHATS)
+lyrical = Registry("lyrical", config.STATE_TTL, config.STATE_MAX_CHATS)
+votemode = Registry("votemode", config.STATE_TTL, per_chat=True)
+confirmer = Registry("confirmer", config.STATE_TTL, per_chat=True)
+
 HAPP = None
 _boot_ = time.time()
 
@@ -38,7 +45,7 @@ XCB = [
 
 def dbb():
     global db
-    db = {}
+    db = QueueStore()
     LOGGER(__name__).info(f"🧺 Local database initialized successfully.")
 
 
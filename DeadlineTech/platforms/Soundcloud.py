@@ -24,23 +24,11 @@
 
 
 
-from os import path
-
-from yt_dlp import YoutubeDL
-
+from DeadlineTech.utils.downloader import download_soundcloud
 from DeadlineTech.utils.formatters import seconds_to_min
 
 
 class SoundAPI:
-    def __init__(self):
-        self.opts = {
-            "outtmpl": "downloads/%(id)s.%(ext)s",
-            "format": "best",
-            "retries": 3,
-            "nooverwrites": False,
-            "continuedl": True,
-        }
-
     async def valid(self, link: str):
         if "soundcloud" in link:
             return True
@@ -48,18 +36,15 @@ class SoundAPI:
             return False
 
     async def download(self, url):
-        d = YoutubeDL(self.opts)
-        try:
-            info = d.extract_info(url)
-        except:
+        entry = await download_soundcloud(url)
+        if not entry:
             return False
-        xyz = path.join("downloads", f"{info['id']}.{info['ext']}")
-        duration_min = seconds_to_min(info["duration"])
+        meta = entry["meta"]
         track_details = {
-            "title": info["title"],
-            "duration_sec": info["duration"],
-            "duration_min": duration_min,
-            "uploader": info["uploader"],
-            "filepath": xyz,
+            "title": meta["title"],
+            "duration_sec": meta["duration"],
+            "duration_min": seconds_to_min(meta["duration"]),
+            "uploader": meta["uploader"],
+            "filepath": entry["path"],
         }
-        return track_details, xyz
+        return track_details, entry["path"]
@@ -26,19 +26,23 @@
 
 import asyncio
 import os
-import time
-from typing import Union
+from typing import Dict, Union
 
-from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup, Voice
+from pyrogram.types import Voice
 
 import config
 from DeadlineTech import app
+from DeadlineTech.misc import lyrical
 from DeadlineTech.utils.formatters import (
     check_duration,
-    convert_bytes,
     get_readable_time,
     seconds_to_min,
 )
+from DeadlineTech.utils.media_cache import media_cache
+from DeadlineTech.utils.progress import ProgressReporter
+from DeadlineTech.utils.stream.relay import relay
+
+_inflight: Dict[str, asyncio.Task] = {}
 
 
 class TeleAPI:
@@ -118,85 +122,61 @@ class TeleAPI:
         return file_name
 
     async def download(self, _, message, mystic, fname):
-        lower = [0, 8, 17, 38, 64, 77, 96]
-        higher = [5, 10, 20, 40, 66, 80, 99]
-        checker = [5, 10, 20, 40, 66, 80, 99]
-        speed_counter = {}
+        key = f"telegram:{os.path.basename(fname)}"
+        if media_cache.get(key):
+            return True
         if os.path.exists(fname):
+            media_cache.put(key, fname, "telegram")
             return True
+        if config.TG_STREAM_MODE:
+            return await self._progressive(message, mystic, fname, key)
+
+        task = _inflight.get(key)
+        if task:
+            await asyncio.wait([task])
+            return media_cache.get(key) is not None
+
+        task = asyncio.create_task(self._fetch(_, message, mystic, fname, key))
+        _inflight[key] = task
+        task.add_done_callback(lambda _t: _inflight.pop(key, None))
+        lyrical[mystic.id] = task
+        await asyncio.wait([task])
+        verify = lyrical.get(mystic.id)
+        if not verify:
+            return False
+        lyrical.pop(mystic.id)
+        return media_cache.get(key) is not None
+
+    async def _progressive(self, message, mystic, fname, key):
+        media = message.reply_to_message
+        file = media.audio or media.voice or media.video or media.document
+        total = getattr(file, "file_size", 0) or 0
+        leader = relay.get(fname) is None
+        prog = await relay.open(app, media, fname, total, key)
+        if leader:
+            lyrical[mystic.id] = prog.task
+        prebuffer = min(config.TG_STREAM_PREBUFFER, total) if total else config.TG_STREAM_PREBUFFER
+        await prog.wait_for(prebuffer - 1)
+        if leader and not lyrical.pop(mystic.id, None):
+            return False
+        return not prog.failed
 
-        async def down_load():
-            async def progress(current, total):
-                if current == total:
-                    return
-                current_time = time.time()
-                start_time = speed_counter.get(message.id)
-                check_time = current_time - start_time
-                upl = InlineKeyboardMarkup(
-                    [
-                        [
-                            InlineKeyboardButton(
-                                text="ᴄᴀɴᴄᴇʟ",
-                                callback_data="stop_downloading",
-                            ),
-                        ]
-                    ]
-                )
-                percentage = current * 100 / total
-                percentage = str(round(percentage, 2))
-                speed = current / check_time
-                eta = int((total - current) / speed)
-                eta = get_readable_time(eta)
-                if not eta:
-                    eta = "0 sᴇᴄᴏɴᴅs"
-                total_size = convert_bytes(total)
-                completed_size = convert_bytes(current)
-                speed = convert_bytes(speed)
-                percentage = int((percentage.split("."))[0])
-                for counter in range(7):
-                    low = int(lower[counter])
-                    high = int(higher[counter])
-                    check = int(checker[counter])
-                    if low < percentage <= high:
-                        if high == check:
-                            try:
-                                await mystic.edit_text(
-                                    text=_["tg_1"].format(
-                                        app.mention,
-                                        total_size,
-                                        completed_size,
-                                        percentage[:5],
-                                        speed,
-                                        eta,
-                                    ),
-                                    reply_markup=upl,
-                                )
-                                checker[counter] = 100
-                            except:
-                                pass
-
-            speed_counter[message.id] = time.time()
-            try:
+    async def _fetch(self, _, message, mystic, fname, key):
+        reporter = ProgressReporter(mystic, _, cancellable=True)
+        try:
+            async with reporter:
                 await app.download_media(
                     message.reply_to_message,
                     file_name=fname,
-                    progress=progress,
+                    progress=reporter.callback,
                 )
-                try:
-                    elapsed = get_readable_time(
-                        int(int(time.time()) - int(speed_counter[message.id]))
-                    )
-                except:
-                    elapsed = "0 sᴇᴄᴏɴᴅs"
-                await mystic.edit_text(_["tg_2"].format(elapsed))
-            except:
-                await mystic.edit_text(_["tg_3"])
-
-        task = asyncio.create_task(down_load())
-        config.lyrical[mystic.id] = task
-        await task
-        verify = config.lyrical.get(mystic.id)
-        if not verify:
-            return False
-        config.lyrical.pop(mystic.id)
-        return True
+            if not os.path.exists(fname):
+                raise FileNotFoundError(fname)
+            media = message.reply_to_message
+            media_cache.put(key, fname, "telegram", chat_id=media.chat.id, message_id=media.id)
+            elapsed = get_readable_time(reporter.elapsed) or "0 sᴇᴄᴏɴᴅs"
+            await mystic.edit_text(_["tg_2"].format(elapsed))
+        except asyncio.CancelledError:
+            raise
+        except:
+            await mystic.edit_text(_["tg_3"])
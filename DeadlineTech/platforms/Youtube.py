@@ -1,7 +1,7 @@
 import asyncio
 import json
-import os
 import re
+import time
 from typing import Dict, List, Optional, Tuple, Union
 import aiofiles
 import httpx
@@ -10,6 +10,7 @@ from pyrogram.enums import MessageEntityType
 from pyrogram.types import Message
 from youtubesearchpython.__future__ import VideosSearch
 from config import API_BASE_URL
+from DeadlineTech.utils.cookies import cookie_pool
 from DeadlineTech.utils.database import is_on_off
 from DeadlineTech.utils.downloader import (
     download_audio,
@@ -18,27 +19,12 @@ from DeadlineTech.utils.downloader import (
     download_song_video,
 )
 from DeadlineTech.utils.formatters import time_to_seconds
+from DeadlineTech.utils.progress import ProgressReporter
 
-COOKIE_PATH = "DeadlineTech/assets/"
 DOWNLOAD_DIR = "downloads"
 CHUNK_SIZE = 8 * 1024 * 1024
 
 
-def _cookiefile_path() -> Optional[str]:
-    path = str(COOKIE_PATH)
-    try:
-        if path and os.path.exists(path) and os.path.getsize(path) > 0:
-            return path
-    except Exception:
-        pass
-    return None
-
-
-def _cookies_args() -> List[str]:
-    p = _cookiefile_path()
-    return ["--cookies", p] if p else []
-
-
 async def _exec_proc(*args: str) -> Tuple[bytes, bytes]:
     proc = await asyncio.create_subprocess_exec(
         *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
@@ -46,6 +32,17 @@ async def _exec_proc(*args: str) -> Tuple[bytes, bytes]:
     return await proc.communicate()
 
 
+async def _exec_ytdlp(*args: str) -> Tuple[bytes, bytes]:
+    cookiefile = cookie_pool.acquire()
+    cookies = ["--cookies", cookiefile] if cookiefile else []
+    start = time.monotonic()
+    stdout, stderr = await _exec_proc("yt-dlp", *cookies, *args)
+    cookie_pool.report(
+        cookiefile, bool(stdout), time.monotonic() - start, stderr.decode(errors="ignore")
+    )
+    return stdout, stderr
+
+
 def _safe_filename(name: str) -> str:
     return re.sub(r'[\\/*?:"<>|]+', "_", (name or "").strip())[:200]
 
@@ -103,7 +100,7 @@ class YouTubeAPI:
 
     async def is_live(self, link: str) -> bool:
         prepared = self._prepare_link(link)
-        stdout, _ = await _exec_proc("yt-dlp", *(_cookies_args()), "--dump-json", prepared)
+        stdout, _ = await _exec_ytdlp("--dump-json", prepared)
         if not stdout:
             return False
         try:
@@ -137,9 +134,7 @@ class YouTubeAPI:
         self, link: str, videoid: Union[str, bool, None] = None
     ) -> Tuple[int, str]:
         link = self._prepare_link(link, videoid)
-        stdout, stderr = await _exec_proc(
-            "yt-dlp",
-            *(_cookies_args()),
+        stdout, stderr = await _exec_ytdlp(
             "-g",
             "-f",
             "best[height<=?720][width<=?1280]",
@@ -153,9 +148,7 @@ class YouTubeAPI:
         if videoid:
             link = self.playlist_url + str(videoid)
         link = link.split("&")[0]
-        stdout, _ = await _exec_proc(
-            "yt-dlp",
-            *(_cookies_args()),
+        stdout, _ = await _exec_ytdlp(
             "-i",
             "--get-id",
             "--flat-playlist",
@@ -175,7 +168,7 @@ class YouTubeAPI:
                 raise ValueError("Track not found via API")
         except Exception:
             prepared = self._prepare_link(link, videoid)
-            stdout, _ = await _exec_proc("yt-dlp", *(_cookies_args()), "--dump-json", prepared)
+            stdout, _ = await _exec_ytdlp("--dump-json", prepared)
             if not stdout:
                 raise ValueError("Track not found (yt-dlp fallback)")
             info = json.loads(stdout.decode())
@@ -192,12 +185,18 @@ class YouTubeAPI:
     async def formats(self, link: str, videoid: Union[str, bool, None] = None) -> Tuple[List[Dict], str]:
         link = self._prepare_link(link, videoid)
         opts = {"quiet": True}
-        cf = _cookiefile_path()
+        cf = cookie_pool.acquire()
         if cf:
             opts["cookiefile"] = cf
         out: List[Dict] = []
         with yt_dlp.YoutubeDL(opts) as ydl:
-            info = ydl.extract_info(link, download=False)
+            start = time.monotonic()
+            try:
+                info = ydl.extract_info(link, download=False)
+            except Exception as e:
+                cookie_pool.report(cf, False, error=str(e))
+                raise
+            cookie_pool.report(cf, True, time.monotonic() - start)
             for fmt in info.get("formats", []):
                 if "dash" in str(fmt.get("format", "")).lower():
                     continue
@@ -246,13 +245,14 @@ class YouTubeAPI:
         title: Union[bool, str, None] = None,
     ) -> Union[Tuple[str, Optional[bool]], Tuple[None, None]]:
         link = self._prepare_link(link, videoid)
+        progress = ProgressReporter(mystic) if mystic else None
 
         if songvideo:
-            p = await download_song_video(link, format_id, title)
+            p = await download_song_video(link, format_id, title, progress)
             return (p, True) if p else (None, None)
 
         if songaudio:
-            p = await download_song_audio(link, format_id, title)
+            p = await download_song_audio(link, format_id, title, progress)
             return (p, True) if p else (None, None)
 
         if video:
@@ -261,8 +261,8 @@ class YouTubeAPI:
                 if status == 1:
                     return stream_url, None
                 raise ValueError("Unable to fetch live stream link")
-            p = await download_video(link, quality=720)
+            p = await download_video(link, quality=720, progress=progress)
             return (p, True) if p else (None, None)
 
-        p = await download_audio(link)
+        p = await download_audio(link, progress)
         return (p, True) if p else (None, None)
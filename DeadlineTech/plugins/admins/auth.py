@@ -4,6 +4,7 @@ from pyrogram import filters
 from pyrogram.types import Message
 
 from DeadlineTech import app
+from DeadlineTech.misc import adminlist
 from DeadlineTech.utils import extract_user, int_to_alpha
 from DeadlineTech.utils.database import (
     delete_authuser,
@@ -13,7 +14,7 @@ from DeadlineTech.utils.database import (
 )
 from DeadlineTech.utils.decorators import AdminActual, language
 from DeadlineTech.utils.inline import close_markup
-from config import BANNED_USERS, adminlist
+from config import BANNED_USERS
 
 
 @app.on_message(filters.command("auth") & filters.group & ~BANNED_USERS)
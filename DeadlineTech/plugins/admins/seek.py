@@ -57,13 +57,21 @@ async def seek_comm(cli, message: Message, _, chat_id):
         file_path = check
     if "index_" in file_path:
         file_path = playing[0]["vidid"]
+    speed = None
+    seek_to, seek_end = seconds_to_min(to_seek), duration
+    if not check and playing[0].get("old_second"):
+        # realtime speed: seek on the original file and keep the filters applied
+        speed = playing[0].get("speed")
+        seek_to = seconds_to_min(int(to_seek * float(speed or 1.0)))
+        seek_end = playing[0]["old_dur"]
     try:
         await Anony.seek_stream(
             chat_id,
             file_path,
-            seconds_to_min(to_seek),
-            duration,
+            seek_to,
+            seek_end,
             playing[0]["streamtype"],
+            speed,
         )
     except:
         return await mystic.edit_text(_["admin_26"], reply_markup=close_markup(_))
@@ -71,6 +79,7 @@ async def seek_comm(cli, message: Message, _, chat_id):
         db[chat_id][0]["played"] -= duration_to_skip
     else:
         db[chat_id][0]["played"] += duration_to_skip
+    Anony.schedule_prearm(chat_id)
     await mystic.edit_text(
         text=_["admin_25"].format(seconds_to_min(to_seek), message.from_user.mention),
         reply_markup=close_markup(_),
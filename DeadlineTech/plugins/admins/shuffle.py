@@ -21,15 +21,19 @@ async def admins(Client, message: Message, _, chat_id):
     if not check:
         return await message.reply_text(_["queue_2"])
     try:
-        popped = check.pop(0)
+        popped = check.popleft()
     except:
         return await message.reply_text(_["admin_15"], reply_markup=close_markup(_))
     check = db.get(chat_id)
     if not check:
-        check.insert(0, popped)
+        check.appendleft(popped)
         return await message.reply_text(_["admin_15"], reply_markup=close_markup(_))
-    random.shuffle(check)
-    check.insert(0, popped)
+    # shuffle a list copy: swapping in place on a deque is O(n) per index
+    rest = list(check)
+    random.shuffle(rest)
+    check.clear()
+    check.append(popped)
+    check.extend(rest)
     await message.reply_text(
         _["admin_16"].format(message.from_user.mention), reply_markup=close_markup(_)
     )
@@ -7,10 +7,11 @@ from DeadlineTech import app
 from DeadlineTech.core.call import Anony
 from DeadlineTech.misc import SUDOERS, db
 from DeadlineTech.utils import AdminRightsCheck
+from DeadlineTech.utils.admin_check import get_admins
 from DeadlineTech.utils.database import is_active_chat, is_nonadmin_chat
 from DeadlineTech.utils.decorators.language import languageCB
 from DeadlineTech.utils.inline import close_markup, speed_markup
-from config import BANNED_USERS, adminlist
+from config import BANNED_USERS
 
 checker = []
 
@@ -50,7 +51,7 @@ async def del_back_playlist(client, CallbackQuery, _):
     is_non_admin = await is_nonadmin_chat(CallbackQuery.message.chat.id)
     if not is_non_admin:
         if CallbackQuery.from_user.id not in SUDOERS:
-            admins = adminlist.get(CallbackQuery.message.chat.id)
+            admins = await get_admins(CallbackQuery.message.chat.id)
             if not admins:
                 return await CallbackQuery.answer(_["admin_13"], show_alert=True)
             else:
@@ -10,10 +10,12 @@ from pytgcalls.exceptions import NoActiveGroupCall
 import config
 from DeadlineTech import Apple, Resso, SoundCloud, Spotify, Telegram, YouTube, app
 from DeadlineTech.core.call import Anony
+from DeadlineTech.misc import lyrical
 from DeadlineTech.utils import seconds_to_min, time_to_seconds
 from DeadlineTech.utils.channelplay import get_channeplayCB
 from DeadlineTech.utils.decorators.language import languageCB
 from DeadlineTech.utils.decorators.play import PlayWrapper
+from DeadlineTech.utils.file_cache import edit_cached_media, send_cached_photo
 from DeadlineTech.utils.formatters import formats
 from DeadlineTech.utils.inline import (
     botplaylist_markup,
@@ -24,7 +26,7 @@ from DeadlineTech.utils.inline import (
 )
 from DeadlineTech.utils.logger import play_logs
 from DeadlineTech.utils.stream.stream import stream
-from config import BANNED_USERS, lyrical
+from config import BANNED_USERS
 
 
 @app.on_message(
@@ -266,7 +268,32 @@ async def play_commnd(
             img = details["thumb"]
             cap = _["play_10"].format(details["title"], details["duration_min"])
         elif await SoundCloud.valid(url):
-            return await mystic.edit_text("❌ SoundCloud streaming and downloading is currently disabled.")
+            try:
+                details, track_path = await SoundCloud.download(url)
+            except:
+                return await mystic.edit_text(_["play_3"])
+            duration_sec = details["duration_sec"]
+            if duration_sec > config.DURATION_LIMIT:
+                return await mystic.edit_text(
+                    _["play_6"].format(config.DURATION_LIMIT_MIN, app.mention)
+                )
+            try:
+                await stream(
+                    _,
+                    mystic,
+                    user_id,
+                    details,
+                    chat_id,
+                    user_name,
+                    message.chat.id,
+                    streamtype="soundcloud",
+                    forceplay=fplay,
+                )
+            except Exception as e:
+                ex_type = type(e).__name__
+                err = e if ex_type == "AssistantErr" else _["general_2"].format(ex_type)
+                return await mystic.edit_text(err)
+            return await mystic.delete()
         else:
             try:
                 await Anony.stream_call(url)
@@ -370,7 +397,8 @@ async def play_commnd(
                 "f" if fplay else "d",
             )
             await mystic.delete()
-            await message.reply_photo(
+            await send_cached_photo(
+                message.reply_photo,
                 photo=img,
                 caption=cap,
                 reply_markup=InlineKeyboardMarkup(buttons),
@@ -388,7 +416,8 @@ async def play_commnd(
                     "f" if fplay else "d",
                 )
                 await mystic.delete()
-                await message.reply_photo(
+                await send_cached_photo(
+                    message.reply_photo,
                     photo=details["thumb"],
                     caption=_["play_10"].format(
                         details["title"].title(),
@@ -406,7 +435,8 @@ async def play_commnd(
                     "f" if fplay else "d",
                 )
                 await mystic.delete()
-                await message.reply_photo(
+                await send_cached_photo(
+                    message.reply_photo,
                     photo=img,
                     caption=cap,
                     reply_markup=InlineKeyboardMarkup(buttons),
@@ -618,8 +648,10 @@ async def slider_queries(client, CallbackQuery, _):
                 duration_min,
             ),
         )
-        return await CallbackQuery.edit_message_media(
-            media=med, reply_markup=InlineKeyboardMarkup(buttons)
+        return await edit_cached_media(
+            CallbackQuery.edit_message_media,
+            med,
+            reply_markup=InlineKeyboardMarkup(buttons),
         )
     if what == "B":
         if rtype == 0:
@@ -639,6 +671,8 @@ async def slider_queries(client, CallbackQuery, _):
                 duration_min,
             ),
         )
-        return await CallbackQuery.edit_message_media(
-            media=med, reply_markup=InlineKeyboardMarkup(buttons)
+        return await edit_cached_media(
+            CallbackQuery.edit_message_media,
+            med,
+            reply_markup=InlineKeyboardMarkup(buttons),
         )
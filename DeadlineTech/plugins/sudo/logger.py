@@ -2,6 +2,7 @@ from pyrogram import filters
 
 from DeadlineTech import app
 from DeadlineTech.misc import SUDOERS
+from DeadlineTech.utils.cookies import cookie_pool
 from DeadlineTech.utils.database import add_off, add_on
 from DeadlineTech.utils.decorators.language import language
 
@@ -25,5 +26,5 @@ async def logger(client, message, _):
 @app.on_message(filters.command(["cookies"]) & SUDOERS)
 @language
 async def logger(client, message, _):
-    await message.reply_document("cookies/logs.csv")
+    await message.reply_document(cookie_pool.dump())
     await message.reply_text("Please check given file to cookies file choosing logs...")
@@ -11,6 +11,7 @@ from pyrogram import filters
 
 import config
 from DeadlineTech import app
+from DeadlineTech.core.snapshot import snapshot
 from DeadlineTech.misc import HAPP, SUDOERS, XCB
 from DeadlineTech.utils.database import (
     get_active_chats,
@@ -75,6 +76,8 @@ async def update_(client, message, _):
     else:
         nrs = await response.edit(_final_updates_, disable_web_page_preview=True)
     os.system("git stash &> /dev/null && git pull")
+    # taken before the chats are marked inactive below, so the updated bot picks them back up
+    await snapshot.save(final=True)
 
     try:
         served_chats = await get_active_chats()
@@ -113,6 +116,8 @@ async def update_(client, message, _):
 @app.on_message(filters.command(["restart"]) & SUDOERS)
 async def restart_(_, message):
     response = await message.reply_text("ʀᴇsᴛᴀʀᴛɪɴɢ...")
+    # taken before the chats are marked inactive below, so the restarted bot picks them back up
+    await snapshot.save(final=True)
     ac_chats = await get_active_chats()
     for x in ac_chats:
         try:
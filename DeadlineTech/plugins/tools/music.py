@@ -1,18 +1,16 @@
 import os
 import re
 import asyncio
-import requests
 import logging
-import urllib.request
-import yt_dlp
-import shutil
-import time
 from pyrogram import Client, filters
 from pyrogram.types import Message, InlineKeyboardMarkup, InlineKeyboardButton, CallbackQuery
-from pyrogram.enums import ChatAction
 from youtubesearchpython.__future__ import VideosSearch
-from config import API_KEY, API_URL, COOKIES_URL, LOGGER_ID  # Ensure they are defined in config.py
-from DeadlineTech import app
+from config import LOGGER_ID  # Ensure it is defined in config.py
+from DeadlineTech import YouTube, app
+from DeadlineTech.utils.database import cache_file, get_cached_file, uncache_file
+from DeadlineTech.utils.downloader import download_audio, download_thumbnail
+from DeadlineTech.utils.file_cache import STALE_ERRORS, song_key
+from DeadlineTech.utils.progress import ProgressReporter
 
 # 📝 Logging Setup
 os.makedirs("logs", exist_ok=True)
@@ -26,10 +24,6 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-MIN_FILE_SIZE = 51200
-DOWNLOADS_DIR = "downloads"
-os.makedirs(DOWNLOADS_DIR, exist_ok=True)
-
 def extract_video_id(link: str) -> str | None:
     patterns = [
         r'youtube\.com\/(?:embed\/|v\/|watch\?v=|watch\?.+&v=)([0-9A-Za-z_-]{11})',
@@ -41,121 +35,6 @@ def extract_video_id(link: str) -> str | None:
             return match.group(1)
     return None
 
-def download_thumbnail(video_id: str) -> str | None:
-    try:
-        url = f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg"
-        path = os.path.join(DOWNLOADS_DIR, f"{video_id}.jpg")
-        urllib.request.urlretrieve(url, path)
-        return path
-    except Exception as e:
-        logger.warning(f"Thumbnail error: {e}")
-        return None
-
-def cookie_txt_file():
-    # Fetch cookies from COOKIES_URL defined in config.py
-    cookies_file_path = os.path.join("cookies", "cookies.txt")
-    os.makedirs("cookies", exist_ok=True)
-
-    try:
-        response = requests.get(COOKIES_URL, timeout=10)
-        if response.status_code == 200:
-            with open(cookies_file_path, 'wb') as f:
-                f.write(response.content)
-            logger.info(f"Cookies downloaded successfully to {cookies_file_path}")
-        else:
-            raise FileNotFoundError(f"Failed to fetch cookies from {COOKIES_URL}. Status: {response.status_code}")
-    except requests.RequestException as e:
-        raise FileNotFoundError(f"Error fetching cookies from {COOKIES_URL}: {e}")
-
-    # Log the chosen file
-    with open(os.path.join("cookies", "logs.csv"), 'a') as file:
-        file.write(f"Chosen File: {cookies_file_path}\n")
-
-    return cookies_file_path
-
-def api_dl(video_id: str) -> str | None:
-    # Construct API URL using API_BASE_URL from config.py
-    api_url = f"{API_URL}?direct&id={video_id}"
-    if API_KEY:  # Append API key only if defined
-        api_url += f"&key={API_KEY}"
-    
-    file_path = os.path.join(DOWNLOADS_DIR, f"{video_id}.mp3")
-
-    # Check if already downloaded
-    if os.path.exists(file_path):
-        logger.info(f"Song {file_path} already exists. Skipping download ✅")
-        return file_path
-
-    try:
-        response = requests.get(api_url, stream=True, timeout=15)
-        if response.status_code == 200:
-            os.makedirs(DOWNLOADS_DIR, exist_ok=True)
-            with open(file_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-            if os.path.getsize(file_path) < MIN_FILE_SIZE:
-                logger.warning(f"Downloaded file is too small or Corrupted ({os.path.getsize(file_path)} bytes). Removing.")
-                os.remove(file_path)
-                return None
-            logger.info(f"Song Downloaded Successfully ✅ {file_path} ({os.path.getsize(file_path)} bytes)")
-            return file_path
-        else:
-            logger.error(f"Failed to download {video_id}. Status: {response.status_code}")
-    except Exception as e:
-        logger.error(f"API download failed: {e}")
-
-    # Fallback to yt-dlp
-    logger.info(f"API download failed for {video_id}. Falling back to yt-dlp.")
-    ydl_opts = {
-        "format": "bestaudio/best",
-        "outtmpl": os.path.join(DOWNLOADS_DIR, f"{video_id}.%(ext)s"),
-        "geo_bypass": True,
-        "nocheckcertificate": True,
-        "quiet": True,
-        "cookiefile": cookie_txt_file(),
-        "no_warnings": True,
-        "postprocessors": [
-            {
-                "key": "FFmpegExtractAudio",
-                "preferredcodec": "mp3",
-                "preferredquality": "192",
-            }
-        ],
-    }
-
-    try:
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(f"https://www.youtube.com/watch?v={video_id}", download=False)
-            if os.path.exists(file_path):
-                logger.info(f"Song {file_path} already exists from yt-dlp cache.")
-                return file_path
-            ydl.download([f"https://www.youtube.com/watch?v={video_id}"])
-            if os.path.exists(file_path):
-                if os.path.getsize(file_path) < MIN_FILE_SIZE:
-                    logger.warning(f"yt-dlp downloaded file is too small ({os.path.getsize(file_path)} bytes). Removing.")
-                    os.remove(file_path)
-                    return None
-                logger.info(f"Song downloaded via yt-dlp successfully: {file_path}")
-                return file_path
-            else:
-                logger.error(f"yt-dlp failed to download {video_id}: File not found.")
-                return None
-    except Exception as e:
-        logger.error(f"yt-dlp download failed for {video_id}: {e}")
-        return None
-
-def parse_duration(duration: str) -> int:
-    parts = list(map(int, duration.split(":")))
-    if len(parts) == 3:
-        h, m, s = parts
-    elif len(parts) == 2:
-        h, m = 0, parts[0]
-        s = parts[1]
-    else:
-        return int(parts[0])
-    return h * 3600 + m * 60 + s
-
 @app.on_message(filters.command(["song", "music"]))
 async def song_command(client: Client, message: Message):
     if len(message.command) < 2:
@@ -191,70 +70,61 @@ async def callback_handler(client: Client, cq: CallbackQuery):
     await cq.message.edit("⏳ 𝖯𝗋𝗈𝖼𝖾𝗌𝗌𝗂𝗇𝗀 𝗍𝗋𝖺𝖼𝗄...")
     await send_audio(client, cq.message, video_id)
 
-async def send_audio(client: Client, message: Message, video_id: str):
+def song_caption(title: str, url: str, duration_str: str) -> str:
+    return f"📻 <b><a href=\"{url}\">{title}</a></b>\n🕒 <b>Duration:</b> {duration_str}\n🔧 <b>Powered by:</b> <a href=\"https://t.me/BillaSpace\">Space-X API</a>"
+
+SONG_MARKUP = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🎧 More Music", url="https://t.me/BillaCore")],
+    [InlineKeyboardButton("💻 Assoiciated with", url="https://t.me/BillaSpace")]
+])
+
+async def song_details(video_id: str):
     try:
-        result = (await VideosSearch(video_id, limit=1).next())["result"][0]
-        title = result.get("title", "Unknown")
-        duration_str = result.get("duration", "0:00")
-        duration = parse_duration(duration_str)
-        url = result.get("link")
+        title, duration_str, duration, _, _ = await YouTube.details(video_id, videoid=True)
+        return title or "Unknown", duration_str or "0:00", duration
     except Exception as e:
         logger.warning(f"Metadata error: {e}")
-        title, duration_str, duration, url = "Unknown", "0:00", 0, None
-
-    thumb_path = await asyncio.to_thread(download_thumbnail, video_id)
-    file_path = await asyncio.to_thread(api_dl, video_id)
-
-    if not file_path:
-        return await message.edit("❌ 𝖢𝗈𝗎𝗅𝖽𝗇’𝗍 𝖽𝗈𝗐𝗇𝗅𝗈𝖺𝖽 𝗍𝗁𝖾 𝗌𝗈𝗇𝗀...")
-
-    # Create a copy of the file for the logger
-    logger_file_path = os.path.join(DOWNLOADS_DIR, f"{video_id}_logger_{int(time.time())}.mp3")
-    shutil.copy(file_path, logger_file_path)
-    logger.info(f"Copied file for logger: {logger_file_path}")
+        return "Unknown", "0:00", 0
 
-    # Send the file to LOGGER_ID
+async def log_song(sent: Message):
+    # Reuse the uploaded file instead of sending a second copy
     try:
-        await client.send_audio(
-            chat_id=LOGGER_ID,  # Ensure LOGGER_ID is defined in config.py
-            audio=logger_file_path,
-            title=title,
-            performer="BillaSpace",
-            duration=duration,
-            caption=f"📻 <b><a href=\"{url}\">{title}</a></b>\n🕒 <b>Duration:</b> {duration_str}\n🔧 <b>Powered by:</b> <a href=\"https://t.me/BillaSpace\">Space-X API</a>",
-            thumb=thumb_path if thumb_path else None
-        )
-        logger.info(f"Audio sent to LOGGER_ID: {LOGGER_ID}")
+        await sent.copy(LOGGER_ID, reply_markup=None)
     except Exception as e:
         logger.error(f"Failed to send audio to LOGGER_ID: {e}")
 
-    # Send the file to the user
+async def send_audio(client: Client, message: Message, video_id: str):
+    key = song_key(video_id)
+    if cached := await get_cached_file(key):
+        try:
+            await message.edit("🎶 𝖲𝖾𝗇𝖽𝗂𝗇𝗀 𝗍𝗋𝖺𝖼𝗄...")
+            return await message.reply_audio(
+                audio=cached["file_id"], caption=cached.get("caption"), reply_markup=SONG_MARKUP
+            )
+        except STALE_ERRORS as e:
+            logger.warning(f"Cached file_id for {video_id} rejected: {e}")
+            await uncache_file(key)
+
+    url = f"https://www.youtube.com/watch?v={video_id}"
+    (title, duration_str, duration), thumb_path, file_path = await asyncio.gather(
+        song_details(video_id),
+        download_thumbnail(video_id),
+        download_audio(url, ProgressReporter(message)),
+    )
+    if not file_path:
+        return await message.edit("❌ 𝖢𝗈𝗎𝗅𝖽𝗇’𝗍 𝖽𝗈𝗐𝗇𝗅𝗈𝖺𝖽 𝗍𝗁𝖾 𝗌𝗈𝗇𝗀...")
+
+    caption = song_caption(title, url, duration_str)
     await message.edit("🎶 𝖲𝖾𝗇𝖽𝗂𝗇𝗀 𝗍𝗋𝖺𝖼𝗄...")
-    sent_message = await message.reply_audio(
+    sent = await message.reply_audio(
         audio=file_path,
         title=title,
         performer="BillaSpace",
         duration=duration,
-        caption=f"📻 <b><a href=\"{url}\">{title}</a></b>\n🕒 <b>Duration:</b> {duration_str}\n🔧 <b>Powered by:</b> <a href=\"https://t.me/BillaSpace\">Space-X API</a>",
+        caption=caption,
         thumb=thumb_path if thumb_path else None,
-        reply_markup=InlineKeyboardMarkup([
-            [InlineKeyboardButton("🎧 More Music", url="https://t.me/BillaCore")],
-            [InlineKeyboardButton("💻 Assoiciated with", url="https://t.me/BillaSpace")]
-        ])
+        reply_markup=SONG_MARKUP,
     )
-
-    # Schedule deletion of the user's file after 5 minutes
-    async def delete_user_file():
-        await asyncio.sleep(300)  # 5 minutes
-        try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                logger.info(f"Deleted user file: {file_path}")
-            # Delete thumbnail if it exists
-            if thumb_path and os.path.exists(thumb_path):
-                os.remove(thumb_path)
-                logger.info(f"Deleted thumbnail: {thumb_path}")
-        except Exception as e:
-            logger.error(f"Error deleting user file {file_path}: {e}")
-
-    asyncio.create_task(delete_user_file())
+    if sent and sent.audio:
+        await cache_file(key, sent.audio.file_id, caption=caption)
+        asyncio.create_task(log_song(sent))
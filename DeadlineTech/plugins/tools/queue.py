@@ -2,20 +2,19 @@ import asyncio
 import os
 
 from pyrogram import filters
-from pyrogram.errors import FloodWait
 from pyrogram.types import CallbackQuery, InputMediaPhoto, Message
 
 import config
 from DeadlineTech import app
 from DeadlineTech.misc import db
 from DeadlineTech.utils import AnonyBin, get_channeplayCB, seconds_to_min
-from DeadlineTech.utils.database import get_cmode, is_active_chat, is_music_playing
+from DeadlineTech.utils.database import get_cmode, is_active_chat
 from DeadlineTech.utils.decorators.language import language, languageCB
+from DeadlineTech.utils.file_cache import edit_cached_media, send_cached_photo
 from DeadlineTech.utils.inline import queue_back_markup, queue_markup
+from DeadlineTech.utils.player_updates import player_updates
 from config import BANNED_USERS
 
-basic = {}
-
 
 def get_image(videoid):
     if os.path.isfile(f"cache/{videoid}.png"):
@@ -96,35 +95,13 @@ async def get_queue(client, message: Message, _):
             got[0]["dur"],
         )
     )
-    basic[videoid] = True
-    mystic = await message.reply_photo(IMAGE, caption=cap, reply_markup=upl)
+    mystic = await send_cached_photo(message.reply_photo, photo=IMAGE, caption=cap, reply_markup=upl)
     if DUR != "Unknown":
-        try:
-            while db[chat_id][0]["vidid"] == videoid:
-                await asyncio.sleep(5)
-                if await is_active_chat(chat_id):
-                    if basic[videoid]:
-                        if await is_music_playing(chat_id):
-                            try:
-                                buttons = queue_markup(
-                                    _,
-                                    DUR,
-                                    "c" if cplay else "g",
-                                    videoid,
-                                    seconds_to_min(db[chat_id][0]["played"]),
-                                    db[chat_id][0]["dur"],
-                                )
-                                await mystic.edit_reply_markup(reply_markup=buttons)
-                            except FloodWait:
-                                pass
-                        else:
-                            pass
-                    else:
-                        break
-                else:
-                    break
-        except:
-            return
+        player_updates.track(
+            chat_id,
+            mystic,
+            lambda played, dur: queue_markup(_, DUR, "c" if cplay else "g", videoid, played, dur),
+        )
 
 
 @app.on_callback_query(filters.regex("GetTimer") & ~BANNED_USERS)
@@ -153,13 +130,13 @@ async def queued_tracks(client, CallbackQuery: CallbackQuery, _):
     if len(got) == 1:
         return await CallbackQuery.answer(_["queue_5"], show_alert=True)
     await CallbackQuery.answer()
-    basic[videoid] = False
+    player_updates.untrack(chat_id, CallbackQuery.message)
     buttons = queue_back_markup(_, what)
     med = InputMediaPhoto(
         media="https://telegra.ph//file/6f7d35131f69951c74ee5.jpg",
         caption=_["queue_1"],
     )
-    await CallbackQuery.edit_message_media(media=med)
+    await edit_cached_media(CallbackQuery.edit_message_media, med)
     j = 0
     msg = ""
     for x in got:
@@ -178,7 +155,7 @@ async def queued_tracks(client, CallbackQuery: CallbackQuery, _):
             msg = msg.replace("✨", "")
         link = await AnonyBin(msg)
         med = InputMediaPhoto(media=link, caption=_["queue_3"].format(link))
-        await CallbackQuery.edit_message_media(media=med, reply_markup=buttons)
+        await edit_cached_media(CallbackQuery.edit_message_media, med, reply_markup=buttons)
     else:
         await asyncio.sleep(1)
         return await CallbackQuery.edit_message_text(msg, reply_markup=buttons)
@@ -236,34 +213,12 @@ async def queue_back(client, CallbackQuery: CallbackQuery, _):
             got[0]["dur"],
         )
     )
-    basic[videoid] = True
 
     med = InputMediaPhoto(media=IMAGE, caption=cap)
-    mystic = await CallbackQuery.edit_message_media(media=med, reply_markup=upl)
+    mystic = await edit_cached_media(CallbackQuery.edit_message_media, med, reply_markup=upl)
     if DUR != "Unknown":
-        try:
-            while db[chat_id][0]["vidid"] == videoid:
-                await asyncio.sleep(5)
-                if await is_active_chat(chat_id):
-                    if basic[videoid]:
-                        if await is_music_playing(chat_id):
-                            try:
-                                buttons = queue_markup(
-                                    _,
-                                    DUR,
-                                    cplay,
-                                    videoid,
-                                    seconds_to_min(db[chat_id][0]["played"]),
-                                    db[chat_id][0]["dur"],
-                                )
-                                await mystic.edit_reply_markup(reply_markup=buttons)
-                            except FloodWait:
-                                pass
-                        else:
-                            pass
-                    else:
-                        break
-                else:
-                    break
-        except:
-            return
+        player_updates.track(
+            chat_id,
+            mystic if isinstance(mystic, Message) else CallbackQuery.message,
+            lambda played, dur: queue_markup(_, DUR, cplay, videoid, played, dur),
+        )
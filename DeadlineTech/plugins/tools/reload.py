@@ -2,18 +2,21 @@ import asyncio
 import time
 
 from pyrogram import filters
-from pyrogram.enums import ChatMembersFilter
 from pyrogram.types import CallbackQuery, Message
 
 from DeadlineTech import app
 from DeadlineTech.core.call import Anony
-from DeadlineTech.misc import db
-from DeadlineTech.utils.database import get_assistant, get_authuser_names, get_cmode
+from DeadlineTech.core.registry import Registry
+from DeadlineTech.misc import db, lyrical
+from DeadlineTech.utils.admin_check import get_admins
+from DeadlineTech.utils.database import get_assistant, get_cmode
 from DeadlineTech.utils.decorators import ActualAdminCB, AdminActual, language
-from DeadlineTech.utils.formatters import alpha_to_int, get_readable_time
-from config import BANNED_USERS, adminlist, lyrical
+from DeadlineTech.utils.formatters import get_readable_time
+from DeadlineTech.utils.stream.autoclear import auto_clean
+from config import BANNED_USERS
 
-rel = {}
+# chat_id -> when /reload may run again
+rel = Registry("rel", ttl=180)
 
 
 @app.on_message(
@@ -29,16 +32,7 @@ async def reload_admin_cache(client, message: Message, _):
             if saved > time.time():
                 left = get_readable_time((int(saved) - int(time.time())))
                 return await message.reply_text(_["reload_1"].format(left))
-        adminlist[message.chat.id] = []
-        async for user in app.get_chat_members(
-            message.chat.id, filter=ChatMembersFilter.ADMINISTRATORS
-        ):
-            if user.privileges.can_manage_video_chats:
-                adminlist[message.chat.id].append(user.user.id)
-        authusers = await get_authuser_names(message.chat.id)
-        for user in authusers:
-            user_id = await alpha_to_int(user)
-            adminlist[message.chat.id].append(user_id)
+        await get_admins(message.chat.id, refresh=True)
         now = int(time.time()) + 180
         rel[message.chat.id] = now
         await message.reply_text(_["reload_2"])
@@ -52,7 +46,8 @@ async def restartbot(client, message: Message, _):
     mystic = await message.reply_text(_["reload_4"].format(app.mention))
     await asyncio.sleep(1)
     try:
-        db[message.chat.id] = []
+        for entry in db.pop(message.chat.id, ()):
+            await auto_clean(entry)
         await Anony.stop_stream_force(message.chat.id)
     except:
         pass
@@ -79,7 +74,8 @@ async def restartbot(client, message: Message, _):
         except:
             pass
         try:
-            db[chat_id] = []
+            for entry in db.pop(chat_id, ()):
+                await auto_clean(entry)
             await Anony.stop_stream_force(chat_id)
         except:
             pass
@@ -1,5 +1,35 @@
+from typing import List
+
 from pyrogram.types import CallbackQuery
-from pyrogram.enums import ChatType, ChatMemberStatus
+from pyrogram.enums import ChatMembersFilter, ChatType, ChatMemberStatus
+
+from DeadlineTech import app
+from DeadlineTech.logging import LOGGER
+from DeadlineTech.misc import adminlist
+from DeadlineTech.utils.database import get_authuser_names
+from DeadlineTech.utils.formatters import alpha_to_int
+
+
+async def get_admins(chat_id: int, refresh: bool = False) -> List[int]:
+    """Admins who can manage video chats plus auth users, from ``adminlist`` or fetched again once it expired."""
+    admins = None if refresh else adminlist.get(chat_id)
+    if admins is not None:
+        return admins
+    admins = []
+    try:
+        async for member in app.get_chat_members(chat_id, filter=ChatMembersFilter.ADMINISTRATORS):
+            if member.privileges and member.privileges.can_manage_video_chats:
+                admins.append(member.user.id)
+        for user in await get_authuser_names(chat_id):
+            admins.append(await alpha_to_int(user))
+    except Exception as e:
+        if refresh:
+            raise
+        LOGGER(__name__).warning(f"Could not fetch the admins of {chat_id}: {e}")
+        return admins
+    adminlist[chat_id] = admins
+    return admins
+
 
 async def is_admin(message_or_cq) -> bool:
     if isinstance(message_or_cq, CallbackQuery):
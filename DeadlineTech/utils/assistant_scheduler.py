@@ -0,0 +1,99 @@
+import random
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional
+
+from config import (
+    ASSISTANT_ERROR_WINDOW,
+    ASSISTANT_FULL_COOLDOWN,
+    ASSISTANT_MAX_ERRORS,
+    ASSISTANT_REBALANCE_THRESHOLD,
+)
+
+from DeadlineTech.core.health import probe
+
+from ..logging import LOGGER
+
+
+class AssistantScheduler:
+    """Places chats on the least loaded healthy assistant.
+
+    Load is the number of live calls an assistant carries, derived from the
+    chat -> assistant assignments and the active chat list. Recent call errors
+    add to the load and, past ``ASSISTANT_MAX_ERRORS``, mark the assistant
+    unhealthy; a ``ChannelsTooMuch`` keeps it out of new placements for
+    ``ASSISTANT_FULL_COOLDOWN`` seconds, and so does failing the health probe.
+    """
+
+    def __init__(self):
+        self._errors: Dict[int, Deque[float]] = {}
+        self._full_until: Dict[int, float] = {}
+
+    def report_error(self, number: Optional[int]):
+        if number is None:
+            return
+        self._errors.setdefault(int(number), deque()).append(time.monotonic())
+
+    def report_full(self, number: Optional[int]):
+        if number is None:
+            return
+        self._full_until[int(number)] = time.monotonic() + ASSISTANT_FULL_COOLDOWN
+        LOGGER(__name__).warning(f"Assistant {number} joined too many chats, pausing new placements")
+
+    def recent_errors(self, number: int) -> int:
+        errors = self._errors.get(int(number))
+        if not errors:
+            return 0
+        horizon = time.monotonic() - ASSISTANT_ERROR_WINDOW
+        while errors and errors[0] < horizon:
+            errors.popleft()
+        return len(errors)
+
+    def healthy(self, number: int) -> bool:
+        if self._full_until.get(int(number), 0) > time.monotonic():
+            return False
+        if probe.is_down(int(number)):
+            return False
+        return self.recent_errors(number) < ASSISTANT_MAX_ERRORS
+
+    @staticmethod
+    def loads(assistants: List[int], assignments: Dict[int, int], active: Iterable[int]) -> Dict[int, int]:
+        load = {number: 0 for number in assistants}
+        for chat_id in active:
+            number = assignments.get(chat_id)
+            if number in load:
+                load[number] += 1
+        return load
+
+    def _score(self, number: int, load: Dict[int, int]) -> int:
+        return load[number] + self.recent_errors(number)
+
+    def pick(self, assistants: List[int], assignments: Dict[int, int], active: Iterable[int]) -> int:
+        load = self.loads(assistants, assignments, active)
+        candidates = [n for n in assistants if self.healthy(n)] or list(assistants)
+        best = min(self._score(n, load) for n in candidates)
+        tied = [n for n in candidates if self._score(n, load) == best]
+        # among equally loaded assistants prefer the most responsive one, if it has been probed
+        probed = [n for n in tied if probe.latency(n) is not None]
+        if probed:
+            return min(probed, key=probe.latency)
+        return random.choice(tied)
+
+    def rebalance_target(
+        self, current: int, assistants: List[int], assignments: Dict[int, int], active: Iterable[int]
+    ) -> Optional[int]:
+        """Assistant an idle chat should move to, or None to keep ``current``."""
+        if len(assistants) < 2:
+            return None
+        load = self.loads(assistants, assignments, active)
+        target = self.pick(assistants, assignments, active)
+        if current not in load:
+            return target
+        if target == current or not self.healthy(target):
+            return None
+        if self.healthy(current) and load[current] - load[target] < ASSISTANT_REBALANCE_THRESHOLD:
+            return None
+        return target
+
+
+scheduler = AssistantScheduler()
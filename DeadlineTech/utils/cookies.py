@@ -0,0 +1,179 @@
+import asyncio
+import glob
+import os
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+from config import COOKIES_REFRESH_INTERVAL, COOKIES_URL
+
+from ..logging import LOGGER
+
+COOKIE_DIR = "cookies"
+REMOTE_COOKIE = os.path.join(COOKIE_DIR, "cookies.txt")
+EXTRA_COOKIES = ("DeadlineTech/cookies.txt", "DeadlineTech/assets/cookies.txt")
+STATS_PATH = os.path.join(COOKIE_DIR, "logs.csv")
+
+FAIL_LIMIT = 3
+QUARANTINE_TIME = 15 * 60
+RATE_LIMIT_TIME = 30 * 60
+LATENCY_ALPHA = 0.3
+
+RATE_LIMIT_MARKERS = ("429", "too many requests", "rate-limit", "rate limit")
+COOKIE_ERROR_MARKERS = (
+    "sign in to confirm",
+    "cookies are no longer valid",
+    "login required",
+    "http error 403",
+)
+
+
+class CookieStats:
+    __slots__ = ("path", "ok", "fail", "streak", "limited", "latency", "last_used", "until")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.ok = 0
+        self.fail = 0
+        self.streak = 0
+        self.limited = 0
+        self.latency = 0.0
+        self.last_used = 0.0
+        self.until = 0.0
+
+    @property
+    def score(self) -> float:
+        rate = (self.ok + 1) / (self.ok + self.fail + 2)
+        return rate / (1 + self.latency / 10)
+
+
+def _is_netscape(path: str) -> bool:
+    try:
+        if os.path.getsize(path) == 0:
+            return False
+        with open(path, "r", errors="ignore") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                if line.startswith("#"):
+                    if "netscape" in line.lower():
+                        return True
+                    continue
+                return line.count("\t") >= 6
+    except OSError:
+        pass
+    return False
+
+
+class CookiePool:
+    """Netscape cookie files used for YouTube extraction, rotated by health."""
+
+    def __init__(self):
+        self._cookies: Dict[str, CookieStats] = {}
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self.reload()
+
+    def reload(self):
+        paths = sorted(glob.glob(os.path.join(COOKIE_DIR, "*.txt"))) + list(EXTRA_COOKIES)
+        found = [p for p in paths if os.path.isfile(p) and _is_netscape(p)]
+        with self._lock:
+            self._cookies = {p: self._cookies.get(p) or CookieStats(p) for p in found}
+        LOGGER(__name__).info(f"Loaded {len(found)} cookie file(s)")
+
+    def acquire(self) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            cookies = list(self._cookies.values())
+            if not cookies:
+                return None
+            healthy = [c for c in cookies if c.until <= now]
+            if healthy:
+                chosen = random.choices(healthy, weights=[c.score for c in healthy])[0]
+            else:
+                chosen = min(cookies, key=lambda c: c.until)
+            chosen.last_used = now
+            return chosen.path
+
+    def report(self, path: Optional[str], ok: bool, latency: float = None, error: str = None):
+        if not path:
+            return
+        with self._lock:
+            stats = self._cookies.get(path)
+            if not stats:
+                return
+            if latency is not None:
+                stats.latency = (
+                    latency
+                    if not stats.latency
+                    else LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * stats.latency
+                )
+            if ok:
+                stats.ok += 1
+                stats.streak = 0
+                return
+            error = (error or "").lower()
+            if any(m in error for m in RATE_LIMIT_MARKERS):
+                stats.limited += 1
+                stats.until = time.time() + RATE_LIMIT_TIME
+                LOGGER(__name__).warning(f"Cookie {path} is rate limited, resting it")
+                return
+            if not any(m in error for m in COOKIE_ERROR_MARKERS):
+                return
+            stats.fail += 1
+            stats.streak += 1
+            if stats.streak >= FAIL_LIMIT:
+                stats.streak = 0
+                stats.until = time.time() + QUARANTINE_TIME
+                LOGGER(__name__).warning(f"Cookie {path} keeps failing, quarantined")
+
+    def dump(self) -> str:
+        now = time.time()
+        os.makedirs(COOKIE_DIR, exist_ok=True)
+        with self._lock:
+            rows: List[str] = ["path,ok,fail,rate_limited,latency,quarantined_for"]
+            for c in self._cookies.values():
+                rows.append(
+                    f"{c.path},{c.ok},{c.fail},{c.limited},{c.latency:.2f},{max(int(c.until - now), 0)}"
+                )
+        with open(STATS_PATH, "w") as f:
+            f.write("\n".join(rows) + "\n")
+        return STATS_PATH
+
+    async def refresh(self) -> bool:
+        if not COOKIES_URL:
+            return False
+        try:
+            async with httpx.AsyncClient(timeout=15, follow_redirects=True) as client:
+                r = await client.get(COOKIES_URL)
+            if r.status_code != 200 or not r.content:
+                LOGGER(__name__).warning(f"Cookie refresh failed with status {r.status_code}")
+                return False
+            os.makedirs(COOKIE_DIR, exist_ok=True)
+            tmp = f"{REMOTE_COOKIE}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(r.content)
+            os.replace(tmp, REMOTE_COOKIE)
+        except (httpx.HTTPError, OSError) as e:
+            LOGGER(__name__).warning(f"Cookie refresh failed: {e}")
+            return False
+        with self._lock:
+            self._cookies.pop(REMOTE_COOKIE, None)
+        self.reload()
+        return True
+
+    async def _refresher(self):
+        while True:
+            await self.refresh()
+            await asyncio.sleep(COOKIES_REFRESH_INTERVAL)
+
+    def start(self):
+        if COOKIES_URL and not self._task:
+            self._task = asyncio.create_task(self._refresher())
+
+
+cookie_pool = CookiePool()
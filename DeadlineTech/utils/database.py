@@ -1,10 +1,12 @@
-import random
 import asyncio
 from datetime import date
 from typing import Dict, List, Union
 from .. import LOGGER
+from config import ASSISTANT_REBALANCE, STATE_MAX_CHATS, STATE_TTL
 from DeadlineTech import userbot
 from DeadlineTech.core.mongo import mongodb
+from DeadlineTech.core.registry import Registry
+from DeadlineTech.utils.assistant_scheduler import scheduler
 
 
 authdb = mongodb.adminauth
@@ -18,6 +20,7 @@ chatsdb = mongodb.chats
 chatdb = mongodb.chat
 channeldb = mongodb.cplaymode
 countdb = mongodb.upcount
+fileiddb = mongodb.fileids
 gbansdb = mongodb.gban
 langdb = mongodb.language
 onoffdb = mongodb.onoffper
@@ -35,12 +38,14 @@ autoend = {}
 autoleave = {}
 count = {}
 channelconnect = {}
-langm = {}
+# file_id cache in front of fileiddb, which stays the source of truth
+fileids = Registry("fileids", STATE_TTL, STATE_MAX_CHATS)
+langm = Registry("langm", STATE_TTL, STATE_MAX_CHATS)
 loop = {}
 maintenance = []
-nonadmin = {}
+nonadmin = Registry("nonadmin", STATE_TTL, STATE_MAX_CHATS)
 pause = {}
-playmode = {}
+playmode = Registry("playmode", STATE_TTL, STATE_MAX_CHATS)
 playtype = {}
 skipmode = {}
 active_lock = asyncio.Lock()  # Lock for thread-safe operations on active list
@@ -53,16 +58,7 @@ async def get_assistant_number(chat_id: int) -> str:
 
 
 async def get_client(assistant: int):
-    if int(assistant) == 1:
-        return userbot.one
-    elif int(assistant) == 2:
-        return userbot.two
-    elif int(assistant) == 3:
-        return userbot.three
-    elif int(assistant) == 4:
-        return userbot.four
-    elif int(assistant) == 5:
-        return userbot.five
+    return userbot.get(assistant)
 
 
 async def set_assistant_new(chat_id, number):
@@ -77,7 +73,7 @@ async def set_assistant_new(chat_id, number):
 async def set_assistant(chat_id):
     from DeadlineTech.core.userbot import assistants
 
-    ran_assistant = random.choice(assistants)
+    ran_assistant = scheduler.pick(assistants, assistantdict, active)
     assistantdict[chat_id] = ran_assistant
     await assdb.update_one(
         {"chat_id": chat_id},
@@ -115,10 +111,27 @@ async def get_assistant(chat_id: int) -> str:
             return userbot
 
 
+async def rebalance_assistant(chat_id):
+    """Move an idle chat off a busy or unhealthy assistant before it starts playing again."""
+    from DeadlineTech.core.userbot import assistants
+
+    if not ASSISTANT_REBALANCE or chat_id in active:
+        return
+    if chat_id not in assistantdict:
+        await get_assistant(chat_id)
+    current = assistantdict.get(chat_id)
+    target = scheduler.rebalance_target(current, assistants, assistantdict, active)
+    if target is None:
+        return
+    assistantdict[chat_id] = target
+    await set_assistant_new(chat_id, target)
+    LOGGER(__name__).info(f"Moved chat {chat_id} from assistant {current} to {target}")
+
+
 async def set_calls_assistant(chat_id):
     from DeadlineTech.core.userbot import assistants
 
-    ran_assistant = random.choice(assistants)
+    ran_assistant = scheduler.pick(assistants, assistantdict, active)
     assistantdict[chat_id] = ran_assistant
     await assdb.update_one(
         {"chat_id": chat_id},
@@ -148,16 +161,7 @@ async def group_assistant(self, chat_id: int) -> int:
             assis = assistant
         else:
             assis = await set_calls_assistant(chat_id)
-    if int(assis) == 1:
-        return self.one
-    elif int(assis) == 2:
-        return self.two
-    elif int(assis) == 3:
-        return self.three
-    elif int(assis) == 4:
-        return self.four
-    elif int(assis) == 5:
-        return self.five
+    return self.get(assis)
 
 
 async def is_skipmode(chat_id: int) -> bool:
@@ -287,6 +291,27 @@ async def set_playtype(chat_id: int, mode: str):
     )
 
 
+async def get_cached_file(key: str) -> Union[dict, None]:
+    entry = fileids.get(key)
+    if not entry:
+        entry = await fileiddb.find_one({"key": key}, {"_id": 0})
+        if not entry:
+            return None
+        fileids[key] = entry
+    return entry
+
+
+async def cache_file(key: str, file_id: str, **meta):
+    entry = {"key": key, "file_id": file_id, **meta}
+    fileids[key] = entry
+    await fileiddb.update_one({"key": key}, {"$set": entry}, upsert=True)
+
+
+async def uncache_file(key: str):
+    fileids.pop(key, None)
+    await fileiddb.delete_one({"key": key})
+
+
 async def get_playmode(chat_id: int) -> str:
     mode = playmode.get(chat_id)
     if not mode:
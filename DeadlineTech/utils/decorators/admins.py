@@ -4,7 +4,8 @@ from pyrogram.enums import ChatType
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 from DeadlineTech import app
-from DeadlineTech.misc import SUDOERS, db
+from DeadlineTech.misc import SUDOERS, confirmer, db
+from DeadlineTech.utils.admin_check import get_admins
 from DeadlineTech.utils.database import (
     get_authuser_names,
     get_cmode,
@@ -15,7 +16,7 @@ from DeadlineTech.utils.database import (
     is_nonadmin_chat,
     is_skipmode,
 )
-from config import SUPPORT_CHAT, adminlist, confirmer
+from config import SUPPORT_CHAT
 from strings import get_string
 from ..formatters import int_to_alpha
 
@@ -70,7 +71,7 @@ def AdminRightsCheck(mystic):
 
             if not await is_nonadmin_chat(message.chat.id):
                 if message.from_user.id not in SUDOERS:
-                    admins = adminlist.get(message.chat.id)
+                    admins = await get_admins(message.chat.id)
                     if not admins or message.from_user.id not in admins:
                         if await is_skipmode(message.chat.id):
                             upvote = await get_upvote_count(chat_id)
@@ -12,22 +12,28 @@ from pyrogram.errors import (
 from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
 
 from DeadlineTech import YouTube, app
+from DeadlineTech.core.registry import Registry
+from DeadlineTech.core.startup import startup
 from DeadlineTech.misc import SUDOERS
+from DeadlineTech.utils.admin_check import get_admins
+from DeadlineTech.utils.assistant_scheduler import scheduler
 from DeadlineTech.utils.database import (
     get_assistant,
+    get_assistant_number,
     get_cmode,
     get_lang,
     get_playmode,
     get_playtype,
     is_active_chat,
     is_maintenance,
+    rebalance_assistant,
 )
 from DeadlineTech.utils.inline import botplaylist_markup
-from config import PLAYLIST_IMG_URL, SUPPORT_CHAT, adminlist
+from config import PLAYLIST_IMG_URL, STATE_MAX_CHATS, STATE_TTL, SUPPORT_CHAT
 from strings import get_string
 
 
-links = {}
+links = Registry("links", STATE_TTL, STATE_MAX_CHATS)
 
 def PlayWrapper(command):
     async def wrapper(client, message):
@@ -43,6 +49,9 @@ def PlayWrapper(command):
                     )
                 )
 
+            if not startup.ready.is_set():
+                return await message.reply_text("⏳ The bot is still starting up, please try again in a moment.")
+
             if await is_maintenance() is False and message.from_user.id not in SUDOERS:
                 return await message.reply_text(
                     f"{app.mention} ɪʃ ʏɴᴅᴇʀ ᴍɐɪɴᴛᴇɴᴀɴᴄᴇ.\nPlease visit <a href={SUPPORT_CHAT}>support chat</a>.",
@@ -84,7 +93,7 @@ def PlayWrapper(command):
             playmode = await get_playmode(message.chat.id)
             playty = await get_playtype(message.chat.id)
             if playty != "Everyone" and message.from_user.id not in SUDOERS:
-                admins = adminlist.get(message.chat.id)
+                admins = await get_admins(message.chat.id)
                 if not admins or message.from_user.id not in admins:
                     return await message.reply_text(_["play_4"])
 
@@ -102,6 +111,7 @@ def PlayWrapper(command):
                 pass
 
             if not await is_active_chat(chat_id):
+                await rebalance_assistant(chat_id)
                 userbot = await get_assistant(chat_id)
                 try:
                     member = await app.get_chat_member(chat_id, userbot.id)
@@ -144,6 +154,7 @@ def PlayWrapper(command):
                     except UserAlreadyParticipant:
                         pass
                     except ChannelsTooMuch:
+                        scheduler.report_full(await get_assistant_number(chat_id))
                         try:
                             chat_title = (await app.get_chat(chat_id)).title
                         except Exception:
@@ -2,16 +2,21 @@ import asyncio
 import contextlib
 import os
 import re
+import time
 from typing import Dict, Optional, Union
 import aiofiles
 import httpx
 from yt_dlp import YoutubeDL
-from config import API_BASE_URL
+from config import API_BASE_URL, DURATION_LIMIT
+from DeadlineTech.utils.cookies import cookie_pool
+from DeadlineTech.utils.media_cache import media_cache
+from DeadlineTech.utils.progress import ProgressReporter
 
 DOWNLOAD_DIR = "downloads"
 CACHE_DIR = "cache"
-COOKIE_PATH = "DeadlineTech/cookies.txt"
 CHUNK_SIZE = 8 * 1024 * 1024
+# anything smaller is an error page or a cut-off download
+MIN_FILE_SIZE = 51200
 SEM = asyncio.Semaphore(1)
 USE_API = True
 
@@ -27,15 +32,6 @@ def extract_video_id(link: str) -> str:
     return link.split("/")[-1].split("?")[0]
 
 
-def _cookiefile_path() -> Optional[str]:
-    try:
-        if COOKIE_PATH and os.path.exists(COOKIE_PATH) and os.path.getsize(COOKIE_PATH) > 0:
-            return COOKIE_PATH
-    except Exception:
-        pass
-    return None
-
-
 def file_exists(video_id: str, ext: str = None) -> Optional[str]:
     exts = [ext] if ext else ("mp3", "m4a", "webm", "mp4")
     for e in exts:
@@ -45,11 +41,28 @@ def file_exists(video_id: str, ext: str = None) -> Optional[str]:
     return None
 
 
+def _normalize_url(url: str) -> str:
+    return url.split("?")[0].split("#")[0].rstrip("/").lower()
+
+
 def _safe_filename(name: str) -> str:
     return re.sub(r'[\\/*?:"<>|]+', "_", (name or "").strip())[:200]
 
 
-def _ytdlp_base_opts() -> Dict[str, Union[str, int, bool]]:
+def _complete(path: Optional[str]) -> Optional[str]:
+    """``path`` if it holds a whole download; files under MIN_FILE_SIZE are removed."""
+    if not path or not os.path.exists(path):
+        return None
+    if os.path.getsize(path) < MIN_FILE_SIZE:
+        with contextlib.suppress(OSError):
+            os.remove(path)
+        return None
+    return path
+
+
+def _ytdlp_base_opts(
+    progress: Optional[ProgressReporter] = None, cookies: bool = True
+) -> Dict[str, Union[str, int, bool]]:
     opts = {
         "outtmpl": f"{DOWNLOAD_DIR}/%(id)s.%(ext)s",
         "quiet": True,
@@ -65,8 +78,10 @@ def _ytdlp_base_opts() -> Dict[str, Union[str, int, bool]]:
         "fragment_retries": 3,
         "cachedir": str(CACHE_DIR),
     }
-    if cookiefile := _cookiefile_path():
+    if cookies and (cookiefile := cookie_pool.acquire()):
         opts["cookiefile"] = cookiefile
+    if progress:
+        opts["progress_hooks"] = [progress.hook]
     return opts
 
 
@@ -86,7 +101,7 @@ async def _get_client() -> httpx.AsyncClient:
     return _client
 
 
-async def api_download_audio(video_id: str) -> Optional[str]:
+async def api_download_audio(video_id: str, progress: Optional[ProgressReporter] = None) -> Optional[str]:
     if not USE_API or not API_BASE_URL:
         return None
     url = f"{API_BASE_URL.rstrip('/')}/mp3?id={video_id}"
@@ -104,16 +119,21 @@ async def api_download_audio(video_id: str) -> Optional[str]:
         async with client.stream("GET", dl_url, timeout=120) as resp:
             if resp.status_code != 200:
                 return None
+            total = int(resp.headers.get("content-length") or 0)
+            done = 0
             async with aiofiles.open(out_path, "wb") as f:
                 async for chunk in resp.aiter_bytes(CHUNK_SIZE):
                     if chunk:
                         await f.write(chunk)
-        return out_path if os.path.exists(out_path) else None
+                        done += len(chunk)
+                        if progress:
+                            progress.update(done, total)
+        return _complete(out_path)
     except Exception:
         return None
 
 
-async def api_download_video(video_id: str, quality: str = "720p") -> Optional[str]:
+async def api_download_video(video_id: str, quality: str = "720p", progress: Optional[ProgressReporter] = None) -> Optional[str]:
     if not USE_API or not API_BASE_URL:
         return None
     url = f"{API_BASE_URL.rstrip('/')}/video?id={video_id}&quality={quality}"
@@ -131,30 +151,65 @@ async def api_download_video(video_id: str, quality: str = "720p") -> Optional[s
         async with client.stream("GET", dl_url, timeout=300) as resp:
             if resp.status_code != 200:
                 return None
+            total = int(resp.headers.get("content-length") or 0)
+            done = 0
             async with aiofiles.open(out_path, "wb") as f:
                 async for chunk in resp.aiter_bytes(CHUNK_SIZE):
                     if chunk:
                         await f.write(chunk)
-        return out_path if os.path.exists(out_path) else None
+                        done += len(chunk)
+                        if progress:
+                            progress.update(done, total)
+        return _complete(out_path)
+    except Exception:
+        return None
+
+
+async def download_thumbnail(video_id: str) -> Optional[str]:
+    key = f"ytthumb:{video_id}"
+    if entry := media_cache.get(key):
+        return entry["path"]
+    out_path = f"{DOWNLOAD_DIR}/{video_id}.jpg"
+    if os.path.exists(out_path):
+        return _remember(key, out_path, "thumb")
+    try:
+        client = await _get_client()
+        r = await client.get(f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg", timeout=15)
+        if r.status_code != 200:
+            return None
+        os.makedirs(DOWNLOAD_DIR, exist_ok=True)
+        async with aiofiles.open(out_path, "wb") as f:
+            await f.write(r.content)
+        return _remember(key, out_path, "thumb")
     except Exception:
         return None
 
 
 def _download_ytdlp_sync(link: str, opts: dict) -> Optional[str]:
+    cookiefile = opts.get("cookiefile")
+    start = time.monotonic()
     try:
         os.makedirs(DOWNLOAD_DIR, exist_ok=True)
         os.makedirs(CACHE_DIR, exist_ok=True)
         with YoutubeDL(opts) as ydl:
             info = ydl.extract_info(link, download=False)
-            vid = info["id"]
-            ext = info.get("ext", "webm")
-            path = f"{DOWNLOAD_DIR}/{vid}.{ext}"
-            if os.path.exists(path):
-                return path
-            ydl.download([link])
-            return path if os.path.exists(path) else None
-    except Exception:
+            info = ydl.process_ie_result(info, download=True)
+            path = _complete(_output_path(ydl, info))
+    except Exception as e:
+        cookie_pool.report(cookiefile, False, error=str(e))
         return None
+    # extraction can pass with a cookie the format fetch then fails on: only a finished download counts
+    if path:
+        cookie_pool.report(cookiefile, True, time.monotonic() - start)
+    return path
+
+
+def _output_path(ydl: YoutubeDL, info: dict) -> str:
+    """Where the download ended up, after postprocessors such as FFmpegExtractAudio renamed it."""
+    for download in info.get("requested_downloads") or ():
+        if download.get("filepath"):
+            return download["filepath"]
+    return info.get("filepath") or ydl.prepare_filename(info)
 
 
 async def _run_ytdlp(link: str, opts: dict) -> Optional[str]:
@@ -162,6 +217,29 @@ async def _run_ytdlp(link: str, opts: dict) -> Optional[str]:
     return await loop.run_in_executor(None, _download_ytdlp_sync, link, opts)
 
 
+def _extract_sync(url: str, opts: dict, max_duration: Optional[int] = None) -> Optional[dict]:
+    """Info of the track at ``url`` and its downloaded ``filepath``, left None past ``max_duration`` seconds."""
+    try:
+        os.makedirs(DOWNLOAD_DIR, exist_ok=True)
+        with YoutubeDL(opts) as ydl:
+            info = ydl.extract_info(url, download=False)
+            if not info or info.get("_type") == "playlist":
+                return None
+            if max_duration and int(info.get("duration") or 0) > max_duration:
+                # the caller rejects it on duration; don't fetch the whole track first
+                info["filepath"] = None
+                return info
+            path = ydl.prepare_filename(info)
+            if not os.path.exists(path):
+                ydl.process_ie_result(info, download=True)
+            if not os.path.exists(path):
+                return None
+            info["filepath"] = path
+            return info
+    except Exception:
+        return None
+
+
 async def _dedup(key: str, runner):
     async with _inflight_lock:
         if key in _inflight:
@@ -180,17 +258,29 @@ async def _dedup(key: str, runner):
             _inflight.pop(key, None)
 
 
-async def download_audio(link: str) -> Optional[str]:
+def _reporting(progress: Optional[ProgressReporter]):
+    return progress if progress else contextlib.nullcontext()
+
+
+def _remember(key: str, path: Optional[str], kind: str = "youtube") -> Optional[str]:
+    if path and os.path.exists(path):
+        media_cache.put(key, path, kind)
+    return path
+
+
+async def download_audio(link: str, progress: Optional[ProgressReporter] = None) -> Optional[str]:
     video_id = extract_video_id(link)
-    if cached := file_exists(video_id, "mp3"):
-        return cached
     key = f"audio:{video_id}"
+    if entry := media_cache.get(key):
+        return entry["path"]
+    if cached := file_exists(video_id, "mp3"):
+        return _remember(key, cached)
     async def run():
-        async with SEM:
-            api_result = await api_download_audio(video_id)
+        async with SEM, _reporting(progress):
+            api_result = await api_download_audio(video_id, progress)
             if api_result and os.path.exists(api_result):
-                return api_result
-            opts = _ytdlp_base_opts()
+                return _remember(key, api_result)
+            opts = _ytdlp_base_opts(progress)
             opts.update({
                 "format": "bestaudio/best",
                 "postprocessors": [{
@@ -200,31 +290,57 @@ async def download_audio(link: str) -> Optional[str]:
                 }],
                 "outtmpl": f"{DOWNLOAD_DIR}/{video_id}.%(ext)s",
             })
-            return await _run_ytdlp(link, opts)
+            return _remember(key, await _run_ytdlp(link, opts))
     return await _dedup(key, run)
 
 
-async def download_video(link: str, quality: int = 720) -> Optional[str]:
+async def download_video(link: str, quality: int = 720, progress: Optional[ProgressReporter] = None) -> Optional[str]:
     video_id = extract_video_id(link)
-    if cached := file_exists(video_id, "mp4"):
-        return cached
     key = f"video:{video_id}:{quality}"
+    if entry := media_cache.get(key):
+        return entry["path"]
+    if cached := file_exists(video_id, "mp4"):
+        return _remember(key, cached)
     async def run():
-        async with SEM:
-            api_result = await api_download_video(video_id, f"{quality}p")
+        async with SEM, _reporting(progress):
+            api_result = await api_download_video(video_id, f"{quality}p", progress)
             if api_result and os.path.exists(api_result):
-                return api_result
+                return _remember(key, api_result)
             height = min(quality, 720)
-            opts = _ytdlp_base_opts()
+            opts = _ytdlp_base_opts(progress)
             opts.update({
                 "format": f"best[height<={height}]/best",
                 "merge_output_format": "mp4",
             })
-            return await _run_ytdlp(link, opts)
+            return _remember(key, await _run_ytdlp(link, opts))
     return await _dedup(key, run)
 
 
-async def download_song_video(link: str, format_id: str, title: str) -> Optional[str]:
+async def download_soundcloud(url: str) -> Optional[Dict]:
+    key = f"soundcloud:{_normalize_url(url)}"
+    if entry := media_cache.get(key):
+        return entry
+    async def run():
+        async with SEM:
+            # the YouTube cookies mean nothing to SoundCloud
+            opts = _ytdlp_base_opts(cookies=False)
+            opts.update({"format": "bestaudio/best"})
+            loop = asyncio.get_running_loop()
+            info = await loop.run_in_executor(None, _extract_sync, url, opts, DURATION_LIMIT)
+        if not info:
+            return None
+        meta = {
+            "title": info.get("title") or "SoundCloud",
+            "duration": int(info.get("duration") or 0),
+            "uploader": info.get("uploader") or "",
+        }
+        if not info["filepath"]:
+            return {"key": key, "path": None, "kind": "soundcloud", "meta": meta}
+        return media_cache.put(key, info["filepath"], "soundcloud", **meta)
+    return await _dedup(key, run)
+
+
+async def download_song_video(link: str, format_id: str, title: str, progress: Optional[ProgressReporter] = None) -> Optional[str]:
     safe_title = _safe_filename(title)
     video_id = extract_video_id(link)
     out_path = f"{DOWNLOAD_DIR}/{safe_title}.mp4"
@@ -232,13 +348,13 @@ async def download_song_video(link: str, format_id: str, title: str) -> Optional
         return out_path
     key = f"song_video:{video_id}:{format_id}:{safe_title}"
     async def run():
-        async with SEM:
-            api_vid = await api_download_video(video_id)
+        async with SEM, _reporting(progress):
+            api_vid = await api_download_video(video_id, progress=progress)
             if api_vid and os.path.exists(api_vid):
                 final_path = f"{DOWNLOAD_DIR}/{safe_title}.mp4"
                 os.replace(api_vid, final_path)
                 return final_path
-            opts = _ytdlp_base_opts()
+            opts = _ytdlp_base_opts(progress)
             opts.update({
                 "format": f"{format_id}+140",
                 "outtmpl": out_path,
@@ -249,7 +365,7 @@ async def download_song_video(link: str, format_id: str, title: str) -> Optional
     return await _dedup(key, run)
 
 
-async def download_song_audio(link: str, format_id: str, title: str) -> Optional[str]:
+async def download_song_audio(link: str, format_id: str, title: str, progress: Optional[ProgressReporter] = None) -> Optional[str]:
     safe_title = _safe_filename(title)
     video_id = extract_video_id(link)
     out_path = f"{DOWNLOAD_DIR}/{safe_title}.mp3"
@@ -257,13 +373,13 @@ async def download_song_audio(link: str, format_id: str, title: str) -> Optional
         return out_path
     key = f"song_audio:{video_id}:{format_id}:{safe_title}"
     async def run():
-        async with SEM:
-            api_audio = await api_download_audio(video_id)
+        async with SEM, _reporting(progress):
+            api_audio = await api_download_audio(video_id, progress)
             if api_audio and os.path.exists(api_audio):
                 final_path = f"{DOWNLOAD_DIR}/{safe_title}.mp3"
                 os.replace(api_audio, final_path)
                 return final_path
-            opts = _ytdlp_base_opts()
+            opts = _ytdlp_base_opts(progress)
             opts.update({
                 "format": format_id,
                 "outtmpl": f"{DOWNLOAD_DIR}/{safe_title}.%(ext)s",
@@ -0,0 +1,86 @@
+import hashlib
+import os
+from typing import Dict, Optional, Tuple
+
+from pyrogram.errors import FileIdInvalid, FileReferenceExpired, MediaEmpty
+from pyrogram.types import InputMediaPhoto
+
+from DeadlineTech import app
+from DeadlineTech.core.registry import Registry
+from DeadlineTech.utils.database import cache_file, get_cached_file, uncache_file
+
+from ..logging import LOGGER
+
+STALE_ERRORS = (FileIdInvalid, FileReferenceExpired, MediaEmpty)
+
+DIGEST_CACHE_SIZE = 2048
+
+# (path, mtime, size) -> sha1 of a rendered image, so unchanged files are hashed once
+_digests: Dict[Tuple[str, int, int], str] = Registry("digests", maxsize=DIGEST_CACHE_SIZE)
+
+
+def _digest(path: str) -> Optional[str]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    stamp = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+    digest = _digests.get(stamp)
+    if not digest:
+        h = hashlib.sha1()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(65536), b""):
+                h.update(block)
+        digest = _digests[stamp] = h.hexdigest()
+    return digest
+
+
+def media_key(kind: str, ident: str) -> str:
+    return f"{app.id}:{kind}:{ident}"
+
+
+def song_key(video_id: str, variant: str = "mp3") -> str:
+    return media_key("song", f"{video_id}:{variant}")
+
+
+def photo_key(photo) -> Optional[str]:
+    if not isinstance(photo, str):
+        return None
+    if photo.startswith(("http://", "https://")):
+        return media_key("url", photo)
+    if os.path.isfile(photo):
+        digest = _digest(photo)
+        return media_key("img", digest) if digest else None
+    return None
+
+
+async def send_cached_photo(method, *args, photo, **kwargs):
+    """Call ``send_photo``/``reply_photo`` reusing the file_id of identical images sent before."""
+    key = photo_key(photo)
+    if key and (cached := await get_cached_file(key)):
+        try:
+            return await method(*args, photo=cached["file_id"], **kwargs)
+        except STALE_ERRORS as e:
+            LOGGER(__name__).warning(f"Dropping stale file_id for {key}: {e}")
+            await uncache_file(key)
+    msg = await method(*args, photo=photo, **kwargs)
+    if key and getattr(msg, "photo", None):
+        await cache_file(key, msg.photo.file_id)
+    return msg
+
+
+async def edit_cached_media(method, media, **kwargs):
+    """Same as :func:`send_cached_photo` for ``edit_message_media`` with an InputMediaPhoto."""
+    key = photo_key(media.media) if isinstance(media, InputMediaPhoto) else None
+    if key and (cached := await get_cached_file(key)):
+        source, media.media = media.media, cached["file_id"]
+        try:
+            return await method(media=media, **kwargs)
+        except STALE_ERRORS as e:
+            LOGGER(__name__).warning(f"Dropping stale file_id for {key}: {e}")
+            await uncache_file(key)
+            media.media = source
+    msg = await method(media=media, **kwargs)
+    if key and getattr(msg, "photo", None):
+        await cache_file(key, msg.photo.file_id)
+    return msg
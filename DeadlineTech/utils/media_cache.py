@@ -0,0 +1,141 @@
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, Optional
+
+from config import MEDIA_CACHE_SIZE_LIMIT
+
+from ..logging import LOGGER
+
+CACHE_DIR = "cache"
+MANIFEST_PATH = os.path.join(CACHE_DIR, "media_manifest.json")
+
+
+def media_path(path: str) -> str:
+    return os.path.abspath(path)
+
+
+class MediaCache:
+    """Manifest of media files on disk, keyed by source (``audio:<id>``, ``telegram:<file>`` ...)."""
+
+    def __init__(
+        self,
+        manifest_path: str = MANIFEST_PATH,
+        limit: int = MEDIA_CACHE_SIZE_LIMIT,
+        in_use: Optional[Callable[[], Iterable[str]]] = None,
+    ):
+        self.manifest_path = manifest_path
+        self.limit = limit
+        # paths that must survive eviction; media_cache gets the queued files from the stream lifecycle
+        self.in_use = in_use or (lambda: ())
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._paths: Dict[str, str] = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.manifest_path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        for entry in sorted(data.values(), key=lambda e: e.get("atime", 0)):
+            if os.path.exists(entry.get("path", "")):
+                self._entries[entry["key"]] = entry
+                self._paths[media_path(entry["path"])] = entry["key"]
+        LOGGER(__name__).info(f"Loaded {len(self._entries)} media cache entries")
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.manifest_path), exist_ok=True)
+            tmp = f"{self.manifest_path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp, self.manifest_path)
+        except OSError as e:
+            LOGGER(__name__).warning(f"Failed to save media cache manifest: {e}")
+
+    def _drop(self, key: str) -> Optional[Dict]:
+        entry = self._entries.pop(key, None)
+        if entry:
+            self._paths.pop(media_path(entry["path"]), None)
+        return entry
+
+    def get(self, key: str) -> Optional[Dict]:
+        entry = self._entries.get(key)
+        if not entry:
+            return None
+        if not os.path.exists(entry["path"]):
+            self._drop(key)
+            return None
+        entry["atime"] = time.time()
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, path: str, kind: str, **meta) -> Dict:
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        self._drop(key)
+        entry = {
+            "key": key,
+            "path": path,
+            "kind": kind,
+            "size": size,
+            "atime": time.time(),
+            "meta": meta,
+        }
+        self._entries[key] = entry
+        self._paths[media_path(path)] = key
+        self.evict(keep=key)
+        self.save()
+        return entry
+
+    def remove(self, key: str):
+        entry = self._drop(key)
+        if not entry:
+            return
+        try:
+            os.remove(entry["path"])
+        except OSError:
+            pass
+        self.save()
+
+    def keys(self):
+        return list(self._entries)
+
+    def is_managed(self, path: str) -> bool:
+        return media_path(path) in self._paths
+
+    def entry_for(self, path: str) -> Optional[Dict]:
+        key = self._paths.get(media_path(path))
+        return self._entries.get(key) if key else None
+
+    def total_size(self) -> int:
+        return sum(e["size"] for e in self._entries.values())
+
+    def evict(self, keep: Optional[str] = None):
+        total = self.total_size()
+        if total <= self.limit:
+            return
+        in_use = {media_path(f) for f in self.in_use() if f}
+        for key in list(self._entries):
+            if total <= self.limit:
+                break
+            entry = self._entries[key]
+            if key == keep or media_path(entry["path"]) in in_use:
+                continue
+            try:
+                os.remove(entry["path"])
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                LOGGER(__name__).warning(f"Failed to evict {entry['path']}: {e}")
+                continue
+            self._drop(key)
+            total -= entry["size"]
+            LOGGER(__name__).info(f"Evicted {entry['path']} from media cache")
+
+
+media_cache = MediaCache()
@@ -0,0 +1,155 @@
+import asyncio
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from pyrogram.errors import FloodWait, MessageNotModified
+from pyrogram.types import InlineKeyboardMarkup
+
+from config import PLAYER_UPDATE_INTERVAL, PLAYER_UPDATE_RATE, PLAYER_UPDATE_VIEWS
+from DeadlineTech.core.registry import on_cleanup
+from DeadlineTech.logging import LOGGER
+from DeadlineTech.misc import db
+from DeadlineTech.utils.database import get_active_chats, get_lang, is_music_playing
+from DeadlineTech.utils.formatters import seconds_to_min
+from DeadlineTech.utils.inline import stream_markup_timer
+from strings import get_string
+
+
+class LiveMessage:
+    """A message whose progress buttons follow the track ``entry``."""
+
+    __slots__ = ("message", "entry", "render", "shown")
+
+    def __init__(self, message, entry, render: Callable):
+        self.message = message
+        self.entry = entry
+        # render(played, dur) -> reply markup
+        self.render = render
+        self.shown: Optional[Tuple[str, str]] = None
+
+
+class PlayerUpdates:
+    """One loop that keeps every live player message ticking.
+
+    Covers the now-playing card of each chat and the ``/player`` views opened on it.
+    Each cycle re-renders the progress buttons of messages whose track is still at
+    the head of the queue, skipping those that would not change, and paces the edits
+    to ``PLAYER_UPDATE_RATE`` per second across all chats. A ``FloodWait`` holds every
+    edit until it expires. Messages of a finished track are dropped.
+    """
+
+    def __init__(self):
+        # chat_id -> (message chat id, message id) -> /player view
+        self.views: Dict[int, Dict[Tuple[int, int], LiveMessage]] = {}
+        # chat_id -> now-playing card
+        self.cards: Dict[int, LiveMessage] = {}
+        self._hold_until = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _key(message) -> Tuple[int, int]:
+        return message.chat.id, message.id
+
+    def track(self, chat_id: int, message, render: Callable):
+        """Keep ``message`` updated while the current track of ``chat_id`` plays."""
+        playing = db.get(chat_id)
+        if not playing or not message:
+            return
+        views = self.views.setdefault(chat_id, {})
+        views.pop(self._key(message), None)
+        views[self._key(message)] = LiveMessage(message, playing[0], render)
+        # several /player views in one chat: only the newest keep ticking
+        while len(views) > PLAYER_UPDATE_VIEWS:
+            views.pop(next(iter(views)))
+
+    def untrack(self, chat_id: int, message):
+        views = self.views.get(chat_id)
+        if views:
+            views.pop(self._key(message), None)
+
+    def drop(self, chat_id: int):
+        self.views.pop(chat_id, None)
+        self.cards.pop(chat_id, None)
+
+    async def _card(self, chat_id: int, entry) -> Optional[LiveMessage]:
+        mystic = entry.get("mystic")
+        if not mystic:
+            self.cards.pop(chat_id, None)
+            return None
+        card = self.cards.get(chat_id)
+        if card and card.message is mystic:
+            return card
+        try:
+            _ = get_string(await get_lang(chat_id))
+        except Exception:
+            _ = get_string("en")
+        card = self.cards[chat_id] = LiveMessage(
+            mystic,
+            entry,
+            lambda played, dur: InlineKeyboardMarkup(stream_markup_timer(_, chat_id, played, dur)),
+        )
+        return card
+
+    async def _edit(self, live: LiveMessage, label: Tuple[str, str]) -> bool:
+        """Edit ``live`` to show ``label``; False if the message can no longer be edited."""
+        if live.shown == label:
+            return True
+        hold = self._hold_until - time.monotonic()
+        if hold > 0:
+            await asyncio.sleep(hold)
+        try:
+            await live.message.edit_reply_markup(reply_markup=live.render(*label))
+        except FloodWait as e:
+            self._hold_until = time.monotonic() + int(e.value)
+            return True
+        except MessageNotModified:
+            pass
+        except Exception:
+            return False
+        live.shown = label
+        await asyncio.sleep(1 / PLAYER_UPDATE_RATE)
+        return True
+
+    async def _update_chat(self, chat_id: int):
+        playing = db.get(chat_id)
+        if not playing:
+            return self.drop(chat_id)
+        entry = playing[0]
+        views = self.views.get(chat_id, {})
+        for key in [key for key, live in views.items() if live.entry is not entry]:
+            views.pop(key)
+        if not int(entry["seconds"] or 0) or not await is_music_playing(chat_id):
+            return
+        label = (seconds_to_min(entry["played"]), entry["dur"])
+        card = await self._card(chat_id, entry)
+        if card and card.render and not await self._edit(card, label):
+            # deleted or no longer ours; leave it until the next track
+            card.render = None
+        for key, live in list(views.items()):
+            if not await self._edit(live, label):
+                views.pop(key, None)
+
+    async def update(self):
+        active = await get_active_chats()
+        for chat_id in set(self.views) | set(self.cards):
+            if chat_id not in active:
+                self.drop(chat_id)
+        for chat_id in active:
+            try:
+                await self._update_chat(chat_id)
+            except Exception as e:
+                LOGGER(__name__).warning(f"Player update failed in {chat_id}: {e}")
+
+    async def _run(self):
+        while True:
+            started = time.monotonic()
+            await self.update()
+            await asyncio.sleep(max(PLAYER_UPDATE_INTERVAL - (time.monotonic() - started), 0))
+
+    def start(self):
+        if not self._task:
+            self._task = asyncio.create_task(self._run())
+
+
+player_updates = PlayerUpdates()
+on_cleanup(player_updates.drop)
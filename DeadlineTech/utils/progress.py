@@ -0,0 +1,123 @@
+import asyncio
+import time
+from typing import Optional
+
+from pyrogram.errors import FloodWait, MessageNotModified
+from pyrogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+
+from DeadlineTech import app
+from DeadlineTech.utils.database import get_lang
+from DeadlineTech.utils.formatters import convert_bytes, get_readable_time
+from strings import get_string
+
+SAMPLE_INTERVAL = 2.0
+EDIT_INTERVAL = 6.0
+MIN_STEP = 5
+EWMA_ALPHA = 0.3
+
+CANCEL_MARKUP = InlineKeyboardMarkup(
+    [[InlineKeyboardButton(text="ᴄᴀɴᴄᴇʟ", callback_data="stop_downloading")]]
+)
+
+
+class ProgressReporter:
+    """Timer-sampled download progress for ``mystic``; ``update``/``hook`` are safe from threads."""
+
+    def __init__(self, mystic, _=None, cancellable: bool = False):
+        self.mystic = mystic
+        self._ = _
+        self.markup = CANCEL_MARKUP if cancellable else None
+        self.current = 0
+        self.total = 0
+        self.speed = 0.0
+        self.started = time.monotonic()
+        self._last = (self.started, 0)
+        self._next_edit = self.started
+        self._shown = -MIN_STEP
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def elapsed(self) -> int:
+        return int(time.monotonic() - self.started)
+
+    def update(self, current: int, total: int = 0):
+        self.current = current
+        if total:
+            self.total = total
+
+    async def callback(self, current: int, total: int):
+        # pyrogram awaits this on its event loop for every chunk; only record it, the ticker edits
+        self.update(current, total)
+
+    def hook(self, d: dict):
+        if d.get("status") == "downloading":
+            self.update(
+                d.get("downloaded_bytes") or 0,
+                d.get("total_bytes") or d.get("total_bytes_estimate") or 0,
+            )
+
+    def start(self):
+        if self.mystic and not self._task:
+            self.started = time.monotonic()
+            self._last = (self.started, self.current)
+            self._next_edit = self.started
+            self._task = asyncio.create_task(self._run())
+        return self
+
+    async def stop(self):
+        task, self._task = self._task, None
+        if task:
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    async def __aenter__(self):
+        return self.start()
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    def _sample(self, now: float):
+        then, seen = self._last
+        if now <= then:
+            return
+        rate = max(self.current - seen, 0) / (now - then)
+        self.speed = rate if not self.speed else EWMA_ALPHA * rate + (1 - EWMA_ALPHA) * self.speed
+        self._last = (now, self.current)
+
+    async def _run(self):
+        if self._ is None:
+            self._ = get_string(await get_lang(self.mystic.chat.id))
+        while True:
+            await asyncio.sleep(SAMPLE_INTERVAL)
+            now = time.monotonic()
+            self._sample(now)
+            if not self.total or now < self._next_edit:
+                continue
+            percentage = int(self.current * 100 / self.total)
+            if percentage >= 100 or percentage - self._shown < MIN_STEP:
+                continue
+            eta = int((self.total - self.current) / self.speed) if self.speed else 0
+            try:
+                await self.mystic.edit_text(
+                    text=self._["tg_1"].format(
+                        app.mention,
+                        convert_bytes(self.total),
+                        convert_bytes(self.current),
+                        percentage,
+                        convert_bytes(self.speed),
+                        get_readable_time(eta) or "0 sᴇᴄᴏɴᴅs",
+                    ),
+                    reply_markup=self.markup,
+                )
+            except FloodWait as e:
+                self._next_edit = now + e.value
+                continue
+            except MessageNotModified:
+                pass
+            except Exception:
+                return
+            self._shown = percentage
+            self._next_edit = now + EDIT_INTERVAL
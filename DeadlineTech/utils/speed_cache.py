@@ -0,0 +1,147 @@
+import asyncio
+import contextlib
+import os
+from typing import Dict, Optional
+
+from config import SPEED_CACHE_SIZE_LIMIT, SPEED_PRERENDER_AFTER, STATE_MAX_CHATS, STATE_TTL
+from DeadlineTech.core.registry import Registry
+from DeadlineTech.logging import LOGGER
+from DeadlineTech.misc import db
+from DeadlineTech.utils.media_cache import MediaCache
+from DeadlineTech.utils.stream.relay import relay
+
+PLAYBACK_DIR = "playback"
+
+# speed -> setpts factor applied to the video track
+SETPTS = {"0.5": 2.0, "0.75": 1.35, "1.5": 0.68, "2.0": 0.5}
+# variants rendered ahead of time for tracks that keep getting sped up
+COMMON_SPEEDS = ("0.75", "1.5")
+
+
+# variant path -> speed switches about to stream it, before any queue entry points at it
+_switching: Dict[str, int] = {}
+
+
+def _queued_variants():
+    # a variant is referenced for as long as a queue entry points at it
+    return [entry.get("speed_path") for queue in db.values() for entry in queue] + list(_switching)
+
+
+speed_cache = MediaCache(
+    os.path.join("cache", "speed_manifest.json"), SPEED_CACHE_SIZE_LIMIT, _queued_variants
+)
+
+_rendering: Dict[str, asyncio.Task] = {}
+# file -> speed changes counted towards SPEED_PRERENDER_AFTER
+_requests = Registry("speed_requests", STATE_TTL, STATE_MAX_CHATS)
+_prerender = asyncio.Semaphore(1)
+
+
+def _key(file_path: str, speed) -> str:
+    return f"speed:{os.path.basename(file_path)}:{speed}"
+
+
+def variant_path(file_path: str, speed) -> str:
+    return os.path.join(PLAYBACK_DIR, str(speed), os.path.basename(file_path))
+
+
+def prune_orphans():
+    """Delete files left in playback/ by older versions or interrupted renders."""
+    for root, _, files in os.walk(PLAYBACK_DIR):
+        for name in files:
+            path = os.path.join(root, name)
+            if not speed_cache.is_managed(path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+
+async def _transcode(file_path: str, speed: str, key: str) -> Optional[str]:
+    out = variant_path(file_path, speed)
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    tmp = f"{out}.part{os.path.splitext(out)[1]}"
+    proc = await asyncio.create_subprocess_exec(
+        "ffmpeg",
+        "-y",
+        "-i",
+        relay.source(file_path),
+        "-filter:v",
+        f"setpts={SETPTS[speed]}*PTS",
+        "-filter:a",
+        f"atempo={speed}",
+        tmp,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await proc.communicate()
+    if proc.returncode != 0:
+        LOGGER(__name__).warning(
+            f"Speed {speed} render failed for {file_path}: {stderr.decode(errors='ignore')[-300:]}"
+        )
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        return None
+    os.replace(tmp, out)
+    speed_cache.put(key, out, "speed", source=file_path, speed=speed)
+    return out
+
+
+async def get_variant(file_path: str, speed) -> Optional[str]:
+    """Path of ``file_path`` re-encoded at ``speed``, rendering it once if needed."""
+    speed = str(speed)
+    if speed not in SETPTS:
+        return None
+    key = _key(file_path, speed)
+    if entry := speed_cache.get(key):
+        return entry["path"]
+    task = _rendering.get(key)
+    if not task:
+        task = asyncio.create_task(_transcode(file_path, speed, key))
+        _rendering[key] = task
+        task.add_done_callback(lambda _t: _rendering.pop(key, None))
+    return await asyncio.shield(task)
+
+
+@contextlib.contextmanager
+def switching(file_path: str, speed):
+    """Keep the ``speed`` variant of ``file_path`` from being evicted while a stream switches to it."""
+    path = variant_path(file_path, speed)
+    _switching[path] = _switching.get(path, 0) + 1
+    try:
+        yield
+    finally:
+        count = _switching.pop(path) - 1
+        if count:
+            _switching[path] = count
+
+
+async def _prerender_common(file_path: str):
+    async with _prerender:
+        for speed in COMMON_SPEEDS:
+            if not os.path.exists(file_path):
+                return
+            try:
+                await get_variant(file_path, speed)
+            except Exception as e:
+                LOGGER(__name__).warning(f"Pre-rendering {speed}x of {file_path} failed: {e}")
+
+
+def note_speed_change(file_path: str):
+    """Count a speed change and pre-render the common speeds once a track is popular."""
+    count = _requests[file_path] = _requests.get(file_path, 0) + 1
+    if count >= SPEED_PRERENDER_AFTER:
+        _requests.pop(file_path)
+        asyncio.create_task(_prerender_common(file_path))
+
+
+def release(popped: Dict):
+    """Called when a queue entry is done; its variant becomes evictable."""
+    if popped.get("speed_path"):
+        speed_cache.evict()
+
+
+prune_orphans()
@@ -1,18 +1,9 @@
-import os
-
-from config import autoclean
+from DeadlineTech.utils.speed_cache import release
+from DeadlineTech.utils.stream.lifecycle import lifecycle
 
 
 async def auto_clean(popped):
-    try:
-        rem = popped["file"]
-        autoclean.remove(rem)
-        count = autoclean.count(rem)
-        if count == 0:
-            if "vid_" not in rem or "live_" not in rem or "index_" not in rem:
-                try:
-                    os.remove(rem)
-                except:
-                    pass
-    except:
-        pass
+    if not popped:
+        return
+    release(popped)
+    lifecycle.release_entry(popped)
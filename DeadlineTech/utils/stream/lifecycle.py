@@ -0,0 +1,84 @@
+import os
+from typing import Dict, List
+
+from DeadlineTech.utils.media_cache import media_cache, media_path
+from DeadlineTech.utils.stream.relay import relay
+
+from ...logging import LOGGER
+
+# queue "files" that are not files on disk: YouTube ids resolved at play time, live and index streams
+VIRTUAL_PREFIXES = ("vid_", "live_", "index_", "http://", "https://")
+
+
+class MediaLifecycle:
+    """Counts how many queue entries reference each media file.
+
+    ``put_queue`` acquires the file of every entry, popping an entry releases it.
+    Nothing is deleted here: once a file is unreferenced it is left to the media
+    cache, which evicts it when the cache goes over its size limit. Files the cache
+    does not know yet (downloads outside the downloader) are adopted into it.
+    """
+
+    def __init__(self):
+        self.refs: Dict[str, int] = {}
+
+    @staticmethod
+    def kind(path: str) -> str:
+        """``virtual``, the cache entry kind (``telegram``, ``audio``...) if managed, else ``file``."""
+        if not path or path.startswith(VIRTUAL_PREFIXES):
+            return "virtual"
+        entry = media_cache.entry_for(path)
+        return entry["kind"] if entry else "file"
+
+    def acquire(self, path: str):
+        if self.kind(path) == "virtual":
+            return
+        path = media_path(path)
+        self.refs[path] = self.refs.get(path, 0) + 1
+
+    def pin(self, entry, path: str):
+        """Hold the file a virtual ``vid_`` entry was downloaded to while the entry is queued."""
+        if not path or self.kind(path) == "virtual":
+            return
+        path = media_path(path)
+        if entry.resolved == path:
+            return
+        if entry.resolved:
+            self.release(entry.resolved)
+        entry.resolved = path
+        self.acquire(path)
+
+    def release_entry(self, entry):
+        self.release(entry["file"])
+        if entry.resolved:
+            self.release(entry.resolved)
+            entry.resolved = None
+
+    def release(self, path: str):
+        if self.kind(path) == "virtual":
+            return
+        path = media_path(path)
+        count = self.refs.get(path, 0) - 1
+        if count > 0:
+            self.refs[path] = count
+            return
+        self.refs.pop(path, None)
+        self._retire(path)
+
+    def _retire(self, path: str):
+        if relay.get(path) or not os.path.exists(path):
+            # still being written; the relay registers it with the cache when done
+            return
+        if media_cache.is_managed(path):
+            media_cache.evict()
+            return
+        media_cache.put(f"file:{path}", path, "file")
+        LOGGER(__name__).info(f"Handed {path} to the media cache")
+
+    def in_use(self) -> List[str]:
+        return list(self.refs)
+
+
+lifecycle = MediaLifecycle()
+# queued files are never evicted
+media_cache.in_use = lifecycle.in_use
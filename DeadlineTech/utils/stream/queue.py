@@ -1,9 +1,12 @@
 import asyncio
 from typing import Union
 
+from DeadlineTech.core.call import Anony
+from DeadlineTech.core.queue import ChatQueue, QueueEntry
 from DeadlineTech.misc import db
 from DeadlineTech.utils.formatters import check_duration, seconds_to_min
-from config import autoclean, time_to_seconds
+from DeadlineTech.utils.stream.lifecycle import lifecycle
+from config import time_to_seconds
 
 
 async def put_queue(
@@ -23,28 +26,30 @@ async def put_queue(
         duration_in_seconds = time_to_seconds(duration) - 3
     except:
         duration_in_seconds = 0
-    put = {
-        "title": title,
-        "dur": duration,
-        "streamtype": stream,
-        "by": user,
-        "user_id": user_id,
-        "chat_id": original_chat_id,
-        "file": file,
-        "vidid": vidid,
-        "seconds": duration_in_seconds,
-        "played": 0,
-    }
+    put = QueueEntry(
+        title=title,
+        dur=duration,
+        streamtype=stream,
+        by=user,
+        user_id=user_id,
+        chat_id=original_chat_id,
+        file=file,
+        vidid=vidid,
+        seconds=duration_in_seconds,
+        played=0,
+    )
     if forceplay:
         check = db.get(chat_id)
         if check:
-            check.insert(0, put)
+            check.appendleft(put)
         else:
-            db[chat_id] = []
-            db[chat_id].append(put)
+            db[chat_id] = ChatQueue([put])
     else:
         db[chat_id].append(put)
-    autoclean.append(file)
+    lifecycle.acquire(file)
+    if db[chat_id][0] is put:
+        # the stream was joined before the track was queued
+        Anony.track_started(chat_id)
 
 
 async def put_queue_index(
@@ -69,23 +74,24 @@ async def put_queue_index(
             dur = 0
     else:
         dur = 0
-    put = {
-        "title": title,
-        "dur": duration,
-        "streamtype": stream,
-        "by": user,
-        "chat_id": original_chat_id,
-        "file": file,
-        "vidid": vidid,
-        "seconds": dur,
-        "played": 0,
-    }
+    put = QueueEntry(
+        title=title,
+        dur=duration,
+        streamtype=stream,
+        by=user,
+        chat_id=original_chat_id,
+        file=file,
+        vidid=vidid,
+        seconds=dur,
+        played=0,
+    )
     if forceplay:
         check = db.get(chat_id)
         if check:
-            check.insert(0, put)
+            check.appendleft(put)
         else:
-            db[chat_id] = []
-            db[chat_id].append(put)
+            db[chat_id] = ChatQueue([put])
     else:
         db[chat_id].append(put)
+    if db[chat_id][0] is put:
+        Anony.track_started(chat_id)
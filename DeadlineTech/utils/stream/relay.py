@@ -0,0 +1,178 @@
+import asyncio
+import os
+import secrets
+from typing import Dict, Optional
+
+import aiofiles
+from aiohttp import web
+
+import config
+from DeadlineTech.utils.media_cache import media_cache
+
+from ...logging import LOGGER
+
+RELAY_HOST = "127.0.0.1"
+READ_SIZE = 256 * 1024
+
+
+class ProgressiveFile:
+    """A Telegram file being written to disk while ffmpeg already reads it over HTTP."""
+
+    def __init__(self, path: str, total: int, key: str):
+        self.path = path
+        self.part = f"{path}.part"
+        self.total = total
+        self.key = key
+        self.token = secrets.token_urlsafe(12)
+        self.written = 0
+        self.done = False
+        self.failed = False
+        self.task: Optional[asyncio.Task] = None
+        self._cond = asyncio.Condition()
+
+    async def _advance(self, written: int = None, done: bool = False, failed: bool = False):
+        async with self._cond:
+            if written is not None:
+                self.written = written
+            self.done = self.done or done
+            self.failed = self.failed or failed
+            self._cond.notify_all()
+
+    async def wait_for(self, offset: int):
+        async with self._cond:
+            await self._cond.wait_for(
+                lambda: self.written > offset or self.done or self.failed
+            )
+
+    async def write_from(self, client, message):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        written = 0
+        try:
+            async with aiofiles.open(self.part, "wb") as f:
+                async for chunk in client.stream_media(message):
+                    await f.write(chunk)
+                    await f.flush()
+                    written += len(chunk)
+                    await self._advance(written)
+            os.replace(self.part, self.path)
+            media_cache.put(self.key, self.path, "telegram", chat_id=message.chat.id, message_id=message.id)
+            await self._advance(written, done=True)
+        except BaseException:
+            await self._advance(failed=True)
+            try:
+                os.remove(self.part)
+            except OSError:
+                pass
+            raise
+
+
+class MediaRelay:
+    """Loopback HTTP endpoint serving progressively downloaded Telegram media to ffmpeg."""
+
+    def __init__(self):
+        self.port = config.TG_STREAM_PORT
+        self._files: Dict[str, ProgressiveFile] = {}
+        self._paths: Dict[str, ProgressiveFile] = {}
+        self._runner: Optional[web.AppRunner] = None
+        self._lock = asyncio.Lock()
+
+    async def start(self):
+        async with self._lock:
+            if self._runner:
+                return
+            server = web.Application()
+            server.router.add_get("/tg/{token}", self._handle)
+            runner = web.AppRunner(server, access_log=None)
+            await runner.setup()
+            site = web.TCPSite(runner, RELAY_HOST, self.port)
+            await site.start()
+            self.port = site._server.sockets[0].getsockname()[1]
+            self._runner = runner
+            LOGGER(__name__).info(f"Telegram media relay listening on {RELAY_HOST}:{self.port}")
+
+    def get(self, path: str) -> Optional[ProgressiveFile]:
+        return self._paths.get(os.path.abspath(path))
+
+    def source(self, path):
+        """Return what ffmpeg should open for ``path``: the relay URL while it is still downloading."""
+        if not isinstance(path, str):
+            return path
+        prog = self.get(path)
+        if not prog or prog.done or prog.failed:
+            return path
+        return f"http://{RELAY_HOST}:{self.port}/tg/{prog.token}"
+
+    async def open(self, client, message, path: str, total: int, key: str) -> ProgressiveFile:
+        await self.start()
+        prog = self.get(path)
+        if prog and not prog.failed:
+            return prog
+        prog = ProgressiveFile(path, total, key)
+        self._files[prog.token] = prog
+        self._paths[os.path.abspath(path)] = prog
+        prog.task = asyncio.create_task(prog.write_from(client, message))
+        prog.task.add_done_callback(lambda _t: self._forget(prog))
+        return prog
+
+    def _forget(self, prog: ProgressiveFile):
+        self._paths.pop(os.path.abspath(prog.path), None)
+        # ffmpeg may reconnect with a Range request shortly after the download finishes
+        asyncio.get_running_loop().call_later(600, self._files.pop, prog.token, None)
+
+    async def _open(self, prog: ProgressiveFile):
+        if not prog.done:
+            try:
+                return await aiofiles.open(prog.part, "rb")
+            except FileNotFoundError:
+                pass
+        return await aiofiles.open(prog.path, "rb")
+
+    async def _handle(self, request: web.Request):
+        prog = self._files.get(request.match_info["token"])
+        if not prog:
+            raise web.HTTPNotFound()
+        start = request.http_range.start or 0
+        if start < 0 and prog.total:
+            start = max(prog.total + start, 0)
+        if prog.total and start >= prog.total:
+            raise web.HTTPRequestRangeNotSatisfiable()
+        headers = {"Accept-Ranges": "bytes", "Content-Type": "application/octet-stream"}
+        status = 200
+        if prog.total:
+            headers["Content-Length"] = str(prog.total - start)
+            if start:
+                status = 206
+                headers["Content-Range"] = f"bytes {start}-{prog.total - 1}/{prog.total}"
+        resp = web.StreamResponse(status=status, headers=headers)
+        await resp.prepare(request)
+        offset = start
+        await prog.wait_for(offset)
+        try:
+            f = await self._open(prog)
+        except OSError as e:
+            LOGGER(__name__).warning(f"Relay open failed for {prog.path}: {e}")
+            return resp
+        try:
+            await f.seek(offset)
+            while True:
+                if not prog.done:
+                    await prog.wait_for(offset)
+                if prog.failed:
+                    break
+                chunk = await f.read(min(READ_SIZE, max(prog.written - offset, 0)) or READ_SIZE)
+                if not chunk:
+                    if prog.done:
+                        break
+                    continue
+                offset += len(chunk)
+                await resp.write(chunk)
+        except ConnectionResetError:
+            pass
+        except OSError as e:
+            LOGGER(__name__).warning(f"Relay read failed for {prog.path}: {e}")
+        finally:
+            await f.close()
+        return resp
+
+
+relay = MediaRelay()
@@ -10,6 +10,7 @@ from DeadlineTech.core.call import Anony
 from DeadlineTech.misc import db
 from DeadlineTech.utils.database import add_active_video_chat, is_active_chat
 from DeadlineTech.utils.exceptions import AssistantErr
+from DeadlineTech.utils.file_cache import send_cached_photo
 from DeadlineTech.utils.inline import aq_markup, close_markup, stream_markup
 from DeadlineTech.utils.pastebin import AnonyBin
 from DeadlineTech.utils.stream.queue import put_queue, put_queue_index
@@ -100,7 +101,8 @@ async def stream(
                 )
                 img = await get_thumb(vidid)
                 button = stream_markup(_, chat_id)
-                run = await app.send_photo(
+                run = await send_cached_photo(
+                    app.send_photo,
                     original_chat_id,
                     photo=img,
                     caption=_["stream_1"].format(
@@ -187,7 +189,8 @@ async def stream(
             )
             img = await get_thumb(vidid)
             button = stream_markup(_, chat_id)
-            run = await app.send_photo(
+            run = await send_cached_photo(
+                app.send_photo,
                 original_chat_id,
                 photo=img,
                 caption=_["stream_1"].format(
@@ -240,7 +243,8 @@ async def stream(
                 forceplay=forceplay,
             )
             button = stream_markup(_, chat_id)
-            run = await app.send_photo(
+            run = await send_cached_photo(
+                app.send_photo,
                 original_chat_id,
                 photo=config.SOUNCLOUD_IMG_URL,
                 caption=_["stream_1"].format(
@@ -294,7 +298,8 @@ async def stream(
             if video:
                 await add_active_video_chat(chat_id)
             button = stream_markup(_, chat_id)
-            run = await app.send_photo(
+            run = await send_cached_photo(
+                app.send_photo,
                 original_chat_id,
                 photo=config.TELEGRAM_VIDEO_URL if video else config.TELEGRAM_AUDIO_URL,
                 caption=_["stream_1"].format(link, title[:23], duration_min, user_name),
@@ -355,7 +360,8 @@ async def stream(
             )
             img = await get_thumb(vidid)
             button = stream_markup(_, chat_id)
-            run = await app.send_photo(
+            run = await send_cached_photo(
+                app.send_photo,
                 original_chat_id,
                 photo=img,
                 caption=_["stream_1"].format(
@@ -412,7 +418,8 @@ async def stream(
                 forceplay=forceplay,
             )
             button = stream_markup(_, chat_id)
-            run = await app.send_photo(
+            run = await send_cached_photo(
+                app.send_photo,
                 original_chat_id,
                 photo=config.STREAM_IMG_URL,
                 caption=_["stream_2"].format(user_name),
@@ -1,67 +1,102 @@
 import os
 import re
-import random
+import asyncio
 import aiohttp
 import aiofiles
 import traceback
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Optional
 
-from PIL import Image, ImageDraw, ImageEnhance, ImageFilter, ImageFont, ImageOps
 from youtubesearchpython.__future__ import VideosSearch
 
-
-def changeImageSize(maxWidth, maxHeight, image):
-    ratio = min(maxWidth / image.size[0], maxHeight / image.size[1])
-    newSize = (int(image.size[0] * ratio), int(image.size[1] * ratio))
-    return image.resize(newSize, Image.ANTIALIAS)
-
-
-def truncate(text, max_chars=50):
-    words = text.split()
-    text1, text2 = "", ""
-    for word in words:
-        if len(text1 + " " + word) <= max_chars and not text2:
-            text1 += " " + word
-        else:
-            text2 += " " + word
-    return [text1.strip(), text2.strip()]
-
-
-def add_rounded_corners(im, radius):
-    circle = Image.new('L', (radius * 2, radius * 2), 0)
-    draw = ImageDraw.Draw(circle)
-    draw.ellipse((0, 0, radius * 2, radius * 2), fill=255)
-    alpha = Image.new('L', im.size, 255)
-    w, h = im.size
-    alpha.paste(circle.crop((0, 0, radius, radius)), (0, 0))
-    alpha.paste(circle.crop((0, radius, radius, radius * 2)), (0, h - radius))
-    alpha.paste(circle.crop((radius, 0, radius * 2, radius)), (w - radius, 0))
-    alpha.paste(circle.crop((radius, radius, radius * 2, radius * 2)), (w - radius, h - radius))
-    im.putalpha(alpha)
-    return im
-
-
-def fit_text(draw, text, max_width, font_path, start_size, min_size):
-    size = start_size
-    while size >= min_size:
-        font = ImageFont.truetype(font_path, size)
-        if draw.textlength(text, font=font) <= max_width:
-            return font
-        size -= 1
-    return ImageFont.truetype(font_path, min_size)
-
-
-def create_rounded_square(image, size, radius=50):
-    image = image.resize((size, size), Image.ANTIALIAS).convert("RGBA")
-    rounded_mask = Image.new("L", (size, size), 0)
-    draw = ImageDraw.Draw(rounded_mask)
-    draw.rounded_rectangle((0, 0, size, size), radius=radius, fill=255)
-    rounded_image = Image.new("RGBA", (size, size))
-    rounded_image.paste(image, (0, 0), mask=rounded_mask)
-    return rounded_image
+from config import (
+    THUMB_CACHE_SIZE_LIMIT,
+    THUMB_FORMAT,
+    THUMB_QUALITY,
+    THUMB_QUEUE_SIZE,
+    THUMB_RENDER_TIMEOUT,
+    THUMB_WORKERS,
+    YOUTUBE_IMG_URL,
+)
+from DeadlineTech.logging import LOGGER
+from DeadlineTech.utils.media_cache import MediaCache
+from DeadlineTech.utils.thumb_render import FORMATS
+# after the package's renderer, which thumb_worker then reuses instead of loading a second copy
+from thumb_worker import render_thumb
+
+# Bump whenever the card layout changes so previously rendered thumbnails are discarded
+TEMPLATE_VERSION = 2
+THUMB_DIR = "cache/thumbs"
+THUMB_EXT = FORMATS.get(THUMB_FORMAT, "jpg")
+
+thumb_cache = MediaCache(os.path.join("cache", "thumb_manifest.json"), THUMB_CACHE_SIZE_LIMIT)
+for _key in thumb_cache.keys():
+    if not _key.endswith(f":v{TEMPLATE_VERSION}"):
+        thumb_cache.remove(_key)
+
+_rendering: Dict[str, asyncio.Task] = {}
+_pool: Optional[ProcessPoolExecutor] = None
+_pending = 0
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # forking the bot itself is unsafe once its threads run: workers come from a
+        # forkserver that loads the renderer through thumb_worker, never the DeadlineTech package
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["thumb_worker"])
+        _pool = ProcessPoolExecutor(max_workers=THUMB_WORKERS, mp_context=context)
+    return _pool
+
+
+def _release():
+    global _pending
+    _pending -= 1
+
+
+async def _run_render(*args) -> Optional[str]:
+    global _pool, _pending
+    if _pending >= THUMB_QUEUE_SIZE:
+        LOGGER(__name__).warning("Thumbnail queue is full, using the default image")
+        return None
+    loop = asyncio.get_running_loop()
+    try:
+        future = _get_pool().submit(render_thumb, *args)
+    except BrokenProcessPool:
+        LOGGER(__name__).warning("Thumbnail worker pool died, restarting it")
+        _pool = None
+        return None
+    # the slot is held until the worker is done, even after a timeout stops the wait
+    _pending += 1
+    future.add_done_callback(lambda _f: loop.call_soon_threadsafe(_release))
+    try:
+        return await asyncio.wait_for(asyncio.wrap_future(future), THUMB_RENDER_TIMEOUT)
+    except asyncio.TimeoutError:
+        LOGGER(__name__).warning(f"Thumbnail render timed out for {args[2]}")
+    except BrokenProcessPool:
+        LOGGER(__name__).warning("Thumbnail worker pool died, restarting it")
+        _pool = None
+    return None
 
 
 async def get_thumb(videoid: str):
+    key = f"thumb:{videoid}:{THUMB_EXT}{THUMB_QUALITY}:v{TEMPLATE_VERSION}"
+    if entry := thumb_cache.get(key):
+        return entry["path"]
+    task = _rendering.get(key)
+    if not task:
+        task = asyncio.create_task(_render_thumb(videoid, key))
+        _rendering[key] = task
+        task.add_done_callback(lambda _t: _rendering.pop(key, None))
+    return await asyncio.shield(task) or YOUTUBE_IMG_URL
+
+
+async def _render_thumb(videoid: str, key: str) -> Optional[str]:
     url = f"https://www.youtube.com/watch?v={videoid}"
+    raw_path = f"cache/thumb{videoid}.png"
     try:
         results = VideosSearch(url, limit=1)
         for result in (await results.next())["result"]:
@@ -74,69 +109,32 @@ async def get_thumb(videoid: str):
         async with aiohttp.ClientSession() as session:
             async with session.get(thumbnail) as resp:
                 if resp.status == 200:
-                    f = await aiofiles.open(f"cache/thumb{videoid}.png", mode="wb")
+                    f = await aiofiles.open(raw_path, mode="wb")
                     await f.write(await resp.read())
                     await f.close()
 
-        youtube = Image.open(f"cache/thumb{videoid}.png")
-        image1 = changeImageSize(1280, 720, youtube)
-        image2 = image1.convert("RGBA")
-
-        gradient = Image.new("RGBA", image2.size, (0, 0, 0, 255))
-        enhancer = ImageEnhance.Brightness(image2.filter(ImageFilter.GaussianBlur(6)))
-        blurred = enhancer.enhance(0.6)
-        background = Image.alpha_composite(gradient, blurred)
-
-        # Rounded Square thumbnail (450x450) with blaze-cut style
-        logo = create_rounded_square(youtube, 450, radius=60)
-        background.paste(logo, (100, 150), logo)
-
-        draw = ImageDraw.Draw(background)
-        font_info = ImageFont.truetype("DeadlineTech/assets/font2.ttf", 28)
-        font_time = ImageFont.truetype("DeadlineTech/assets/font2.ttf", 26)
-        font_path = "DeadlineTech/assets/font3.ttf"
-
-        title_max_width = 540
-        title_lines = truncate(title, 35)
-
-        title_font1 = fit_text(draw, title_lines[0], title_max_width, font_path, 42, 28)
-        draw.text((565, 180), title_lines[0], (255, 255, 255), font=title_font1)
-
-        if title_lines[1]:
-            title_font2 = fit_text(draw, title_lines[1], title_max_width, font_path, 36, 24)
-            draw.text((565, 225), title_lines[1], (220, 220, 220), font=title_font2)
-
-        draw.text((565, 305), f"{channel} | {views}", (240, 240, 240), font=font_info)
-
-        # Progress bar and duration
-        rand = (random.randint(100, 255), random.randint(100, 255), random.randint(100, 255))
-        draw.line([(565, 370), (990, 370)], fill=rand, width=6)
-        draw.ellipse([(990, 362), (1010, 382)], outline=rand, fill=rand, width=12)
-        draw.text((1080, 385), duration, (255, 255, 255), font=font_time)
-
-        # Watermark
-        watermark_font = ImageFont.truetype("DeadlineTech/assets/font2.ttf", 24)
-        watermark_text = "Billa=Space-X"
-        text_size = draw.textsize(watermark_text, font=watermark_font)
-        x = background.width - text_size[0] - 25
-        y = background.height - text_size[1] - 25
-        glow_pos = [(x + dx, y + dy) for dx in (-1, 1) for dy in (-1, 1)]
-        for pos in glow_pos:
-            draw.text(pos, watermark_text, font=watermark_font, fill=(0, 0, 0, 180))
-        draw.text((x, y), watermark_text, font=watermark_font, fill=(255, 255, 255, 240))
-
-        # Final touch
-        background = add_rounded_corners(background, 30)
-
-        try:
-            os.remove(f"cache/thumb{videoid}.png")
-        except:
-            pass
-
-        tpath = f"cache/{videoid}.png"
-        background.save(tpath)
+        os.makedirs(THUMB_DIR, exist_ok=True)
+        tpath = await _run_render(
+            raw_path,
+            # one file per cache key, so evicting one entry never deletes another's file
+            f"{THUMB_DIR}/{videoid}_{THUMB_EXT}{THUMB_QUALITY}_v{TEMPLATE_VERSION}.{THUMB_EXT}",
+            videoid,
+            title,
+            duration,
+            views,
+            channel,
+            THUMB_FORMAT,
+            THUMB_QUALITY,
+        )
+        if tpath:
+            thumb_cache.put(key, tpath, "thumb")
         return tpath
 
     except:
         traceback.print_exc()
         return None
+    finally:
+        try:
+            os.remove(raw_path)
+        except:
+            pass
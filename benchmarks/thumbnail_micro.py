@@ -0,0 +1,167 @@
+"""Renders-per-second of the thumbnail card, before and after the renderer core.
+
+Run from the repository root (fonts are loaded from DeadlineTech/assets):
+
+    python benchmarks/thumbnail_micro.py [--seconds 5]
+
+``legacy_render`` is the pre-cache implementation kept verbatim for comparison.
+No network access or bot configuration is needed.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import warnings
+
+from PIL import Image, ImageDraw, ImageEnhance, ImageFilter, ImageFont
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# loads the renderer without DeadlineTech/__init__ (which starts the clients)
+from thumb_worker import load_renderer  # noqa: E402
+
+
+def make_fixture(path, size=(1280, 720), seed=0):
+    rng = random.Random(seed)
+    image = Image.linear_gradient("L").resize(size).convert("RGB")
+    draw = ImageDraw.Draw(image)
+    for _ in range(40):
+        x, y = rng.randrange(size[0]), rng.randrange(size[1])
+        r = rng.randrange(20, 200)
+        color = tuple(rng.randrange(256) for _ in range(3))
+        draw.ellipse((x - r, y - r, x + r, y + r), fill=color)
+    image.save(path, "JPEG", quality=90)
+    return path
+
+
+def legacy_render(raw_path, out_path, title, duration, views, channel):
+    def changeImageSize(maxWidth, maxHeight, image):
+        ratio = min(maxWidth / image.size[0], maxHeight / image.size[1])
+        newSize = (int(image.size[0] * ratio), int(image.size[1] * ratio))
+        return image.resize(newSize, Image.ANTIALIAS)
+
+    def truncate(text, max_chars=50):
+        words = text.split()
+        text1, text2 = "", ""
+        for word in words:
+            if len(text1 + " " + word) <= max_chars and not text2:
+                text1 += " " + word
+            else:
+                text2 += " " + word
+        return [text1.strip(), text2.strip()]
+
+    def add_rounded_corners(im, radius):
+        circle = Image.new('L', (radius * 2, radius * 2), 0)
+        draw = ImageDraw.Draw(circle)
+        draw.ellipse((0, 0, radius * 2, radius * 2), fill=255)
+        alpha = Image.new('L', im.size, 255)
+        w, h = im.size
+        alpha.paste(circle.crop((0, 0, radius, radius)), (0, 0))
+        alpha.paste(circle.crop((0, radius, radius, radius * 2)), (0, h - radius))
+        alpha.paste(circle.crop((radius, 0, radius * 2, radius)), (w - radius, 0))
+        alpha.paste(circle.crop((radius, radius, radius * 2, radius * 2)), (w - radius, h - radius))
+        im.putalpha(alpha)
+        return im
+
+    def fit_text(draw, text, max_width, font_path, start_size, min_size):
+        size = start_size
+        while size >= min_size:
+            font = ImageFont.truetype(font_path, size)
+            if draw.textlength(text, font=font) <= max_width:
+                return font
+            size -= 1
+        return ImageFont.truetype(font_path, min_size)
+
+    def create_rounded_square(image, size, radius=50):
+        image = image.resize((size, size), Image.ANTIALIAS).convert("RGBA")
+        rounded_mask = Image.new("L", (size, size), 0)
+        draw = ImageDraw.Draw(rounded_mask)
+        draw.rounded_rectangle((0, 0, size, size), radius=radius, fill=255)
+        rounded_image = Image.new("RGBA", (size, size))
+        rounded_image.paste(image, (0, 0), mask=rounded_mask)
+        return rounded_image
+
+    youtube = Image.open(raw_path)
+    image1 = changeImageSize(1280, 720, youtube)
+    image2 = image1.convert("RGBA")
+    gradient = Image.new("RGBA", image2.size, (0, 0, 0, 255))
+    enhancer = ImageEnhance.Brightness(image2.filter(ImageFilter.GaussianBlur(6)))
+    blurred = enhancer.enhance(0.6)
+    background = Image.alpha_composite(gradient, blurred)
+    logo = create_rounded_square(youtube, 450, radius=60)
+    background.paste(logo, (100, 150), logo)
+    draw = ImageDraw.Draw(background)
+    font_info = ImageFont.truetype("DeadlineTech/assets/font2.ttf", 28)
+    font_time = ImageFont.truetype("DeadlineTech/assets/font2.ttf", 26)
+    font_path = "DeadlineTech/assets/font3.ttf"
+    title_lines = truncate(title, 35)
+    title_font1 = fit_text(draw, title_lines[0], 540, font_path, 42, 28)
+    draw.text((565, 180), title_lines[0], (255, 255, 255), font=title_font1)
+    if title_lines[1]:
+        title_font2 = fit_text(draw, title_lines[1], 540, font_path, 36, 24)
+        draw.text((565, 225), title_lines[1], (220, 220, 220), font=title_font2)
+    draw.text((565, 305), f"{channel} | {views}", (240, 240, 240), font=font_info)
+    rand = (random.randint(100, 255), random.randint(100, 255), random.randint(100, 255))
+    draw.line([(565, 370), (990, 370)], fill=rand, width=6)
+    draw.ellipse([(990, 362), (1010, 382)], outline=rand, fill=rand, width=12)
+    draw.text((1080, 385), duration, (255, 255, 255), font=font_time)
+    watermark_font = ImageFont.truetype("DeadlineTech/assets/font2.ttf", 24)
+    watermark_text = "Billa=Space-X"
+    text_size = draw.textsize(watermark_text, font=watermark_font)
+    x = background.width - text_size[0] - 25
+    y = background.height - text_size[1] - 25
+    for pos in [(x + dx, y + dy) for dx in (-1, 1) for dy in (-1, 1)]:
+        draw.text(pos, watermark_text, font=watermark_font, fill=(0, 0, 0, 180))
+    draw.text((x, y), watermark_text, font=watermark_font, fill=(255, 255, 255, 240))
+    background = add_rounded_corners(background, 30)
+    background.save(out_path)
+    return out_path
+
+
+def rate(fn, seconds):
+    fn()  # warm caches the same way a long-running worker would
+    count, start = 0, time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        fn()
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=5.0, help="time spent on each variant")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    # pillow==9.5 warns about ANTIALIAS/textsize on every call
+    warnings.simplefilter("ignore", DeprecationWarning)
+    renderer = load_renderer()
+    meta = ("Some Fairly Long Song Title That Needs Two Lines To Fit", "4:20", "1.2M views", "Channel")
+    with tempfile.TemporaryDirectory() as tmp:
+        raw = make_fixture(os.path.join(tmp, "raw.jpg"))
+        variants = [
+            ("legacy png", lambda: legacy_render(raw, os.path.join(tmp, "legacy.png"), *meta)),
+        ]
+        for fmt, quality in (("PNG", 0), ("JPEG", 85), ("WEBP", 80)):
+            out = os.path.join(tmp, f"card.{renderer.FORMATS[fmt]}")
+            variants.append(
+                (
+                    f"core {fmt.lower()}" + (f" q{quality}" if quality else ""),
+                    lambda out=out, fmt=fmt, quality=quality: renderer.render_thumb(
+                        raw, out, "fixture", *meta, fmt=fmt, quality=quality
+                    ),
+                )
+            )
+        baseline = None
+        for name, fn in variants:
+            rps = rate(fn, args.seconds)
+            baseline = baseline or rps
+            print(f"{name:<16} {rps:7.2f} renders/s  x{rps / baseline:.2f}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""Offline benchmark and regression check for the thumbnail renderer.
+
+Run from the repository root:
+
+    python benchmarks/thumbnails.py                 # benchmark + golden check
+    python benchmarks/thumbnails.py --check         # golden check only (exit 1 on drift)
+    python benchmarks/thumbnails.py --update-golden # accept the current output
+
+Each format/quality variant runs in its own process, so the reported peak RSS
+belongs to that variant alone. Golden images are stored downscaled to keep the
+repository small; an exact match is first tried on a hash of the full-size
+pixels, then the downscaled output is compared within a small tolerance.
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+
+from PIL import Image, ImageChops, ImageStat
+
+from thumbnail_micro import ROOT  # also puts the repository root on sys.path
+from thumb_worker import load_renderer
+
+BENCH_DIR = os.path.join(ROOT, "benchmarks")
+FIXTURE_DIR = os.path.join(BENCH_DIR, "fixtures")
+GOLDEN_DIR = os.path.join(BENCH_DIR, "golden")
+GOLDEN_MANIFEST = os.path.join(GOLDEN_DIR, "manifest.json")
+GOLDEN_SIZE = (320, 180)
+
+# mean/max absolute channel difference allowed on the downscaled golden
+MEAN_TOLERANCE = 1.0
+MAX_TOLERANCE = 48
+
+CASES = [
+    {
+        "name": "hq720_two_lines",
+        "fixture": "hq720.jpg",
+        "videoid": "dQw4w9WgXcQ",
+        "title": "Never Gonna Give You Up Official Music Video Remastered In 4K",
+        "duration": "3:33",
+        "views": "1.5B views",
+        "channel": "Rick Astley",
+    },
+    {
+        "name": "hqdefault_short",
+        "fixture": "hqdefault.jpg",
+        "videoid": "kJQP7kiw5Fk",
+        "title": "Despacito",
+        "duration": "4:42",
+        "views": "8.4B views",
+        "channel": "Luis Fonsi",
+    },
+    {
+        "name": "alpha_long_duration",
+        "fixture": "alpha.png",
+        "videoid": "9bZkp7q19f0",
+        "title": "Gangnam Style Kangnam Seutail Live Mix",
+        "duration": "1:02:10",
+        "views": "5.1B views",
+        "channel": "officialpsy",
+    },
+]
+
+VARIANTS = [
+    ("PNG", 0),
+    ("JPEG", 75),
+    ("JPEG", 85),
+    ("JPEG", 95),
+    ("WEBP", 75),
+    ("WEBP", 85),
+]
+
+
+def _render(renderer, case, out_path, fmt="PNG", quality=0):
+    return renderer.render_thumb(
+        os.path.join(FIXTURE_DIR, case["fixture"]),
+        out_path,
+        case["videoid"],
+        case["title"],
+        case["duration"],
+        case["views"],
+        case["channel"],
+        fmt=fmt,
+        quality=quality,
+    )
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def _bench_variant(fmt, quality, iterations, queue):
+    warnings.simplefilter("ignore", DeprecationWarning)
+    renderer = load_renderer()
+    timings, sizes = [], []
+    with tempfile.TemporaryDirectory() as tmp:
+        for case in CASES:
+            out = os.path.join(tmp, f"{case['name']}.{renderer.FORMATS[fmt]}")
+            _render(renderer, case, out, fmt, quality)  # warm fonts and layers
+            for _ in range(iterations):
+                start = time.perf_counter()
+                _render(renderer, case, out, fmt, quality)
+                timings.append((time.perf_counter() - start) * 1000)
+                sizes.append(os.path.getsize(out))
+    queue.put(
+        {
+            "p50": _percentile(timings, 50),
+            "p95": _percentile(timings, 95),
+            "rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+            "bytes": statistics.mean(sizes),
+        }
+    )
+
+
+def benchmark(iterations):
+    ctx = multiprocessing.get_context("fork")
+    print(f"{'variant':<10} {'p50 ms':>8} {'p95 ms':>8} {'peak MiB':>9} {'avg KiB':>8}")
+    for fmt, quality in VARIANTS:
+        queue = ctx.Queue()
+        proc = ctx.Process(target=_bench_variant, args=(fmt, quality, iterations, queue))
+        proc.start()
+        result = queue.get()
+        proc.join()
+        name = fmt.lower() + (f" q{quality}" if quality else "")
+        print(
+            f"{name:<10} {result['p50']:8.1f} {result['p95']:8.1f} "
+            f"{result['rss']:9.1f} {result['bytes'] / 1024:8.1f}"
+        )
+
+
+def _pixel_hash(image):
+    return hashlib.sha256(image.convert("RGBA").tobytes()).hexdigest()
+
+
+def _load_manifest():
+    try:
+        with open(GOLDEN_MANIFEST) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def check_golden(update=False):
+    renderer = load_renderer()
+    manifest = {} if update else _load_manifest()
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        for case in CASES:
+            out = _render(renderer, case, os.path.join(tmp, f"{case['name']}.png"))
+            image = Image.open(out).convert("RGBA")
+            small = image.resize(GOLDEN_SIZE, Image.LANCZOS)
+            golden_path = os.path.join(GOLDEN_DIR, f"{case['name']}.png")
+            if update:
+                os.makedirs(GOLDEN_DIR, exist_ok=True)
+                small.save(golden_path, optimize=True)
+                manifest[case["name"]] = {"sha256": _pixel_hash(image), "size": list(image.size)}
+                print(f"{case['name']:<20} updated")
+                continue
+            expected = manifest.get(case["name"])
+            if not expected or not os.path.exists(golden_path):
+                print(f"{case['name']:<20} MISSING golden, run with --update-golden")
+                failed = True
+                continue
+            if list(image.size) != expected["size"]:
+                print(f"{case['name']:<20} FAIL size {image.size} != {tuple(expected['size'])}")
+                failed = True
+                continue
+            if _pixel_hash(image) == expected["sha256"]:
+                print(f"{case['name']:<20} exact")
+                continue
+            diff = ImageChops.difference(small, Image.open(golden_path).convert("RGBA"))
+            mean = max(ImageStat.Stat(diff).mean)
+            peak = max(high for _, high in diff.getextrema())
+            ok = mean <= MEAN_TOLERANCE and peak <= MAX_TOLERANCE
+            failed = failed or not ok
+            print(f"{case['name']:<20} {'ok' if ok else 'FAIL'} mean diff {mean:.2f}, max diff {peak}")
+    if update:
+        with open(GOLDEN_MANIFEST, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+            f.write("\n")
+    return not failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=10, help="renders per case and variant")
+    parser.add_argument("--check", action="store_true", help="only verify the golden images")
+    parser.add_argument("--update-golden", action="store_true", help="overwrite the golden images")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    warnings.simplefilter("ignore", DeprecationWarning)
+    if args.update_golden:
+        check_golden(update=True)
+        return 0
+    if not args.check:
+        benchmark(args.iterations)
+        print()
+    return 0 if check_golden() else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
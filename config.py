@@ -1,5 +1,5 @@
 import re
-from os import getenv
+from os import environ, getenv
 
 from dotenv import load_dotenv
 from pyrogram import filters
@@ -22,6 +22,9 @@ API_URL = getenv("API_URL", None)
 # Get COOKIES_URL for fetching cookies.txt in Netscape format
 COOKIES_URL = getenv("COOKIES_URL", None)
 
+# How often (in seconds) cookies are re-fetched from COOKIES_URL
+COOKIES_REFRESH_INTERVAL = int(getenv("COOKIES_REFRESH_INTERVAL", 21600))
+
 # Get optional API_KEY for API authentication (if required)
 API_KEY = getenv("API_KEY", None)
 
@@ -57,6 +60,24 @@ SUPPORT_CHAT = getenv("SUPPORT_CHAT", "https://t.me/BillaCore")
 # Set this to True if you want the assistant to automatically leave chats after an interval
 AUTO_LEAVING_ASSISTANT = bool(getenv("AUTO_LEAVING_ASSISTANT", False))
 
+# Assistant scheduling: an assistant with ASSISTANT_MAX_ERRORS call errors in the last
+# ASSISTANT_ERROR_WINDOW seconds, or that hit ChannelsTooMuch in the last ASSISTANT_FULL_COOLDOWN
+# seconds, gets no new chats. With ASSISTANT_REBALANCE, an idle chat whose assistant carries
+# ASSISTANT_REBALANCE_THRESHOLD more calls than the least loaded one is moved before its next play.
+ASSISTANT_ERROR_WINDOW = int(getenv("ASSISTANT_ERROR_WINDOW", 600))
+ASSISTANT_MAX_ERRORS = int(getenv("ASSISTANT_MAX_ERRORS", 5))
+ASSISTANT_FULL_COOLDOWN = int(getenv("ASSISTANT_FULL_COOLDOWN", 21600))
+ASSISTANT_REBALANCE = str(getenv("ASSISTANT_REBALANCE", "False")).lower() == "true"
+ASSISTANT_REBALANCE_THRESHOLD = int(getenv("ASSISTANT_REBALANCE_THRESHOLD", 2))
+# Seconds each assistant gets to come online at startup before it is skipped
+ASSISTANT_START_TIMEOUT = int(getenv("ASSISTANT_START_TIMEOUT", 60))
+# Assistant health probe: ping every PING_INTERVAL seconds with a PING_TIMEOUT, keep the last
+# PING_HISTORY results, and treat an assistant as down after PING_DOWN_AFTER failures in a row
+PING_INTERVAL = int(getenv("PING_INTERVAL", 30))
+PING_TIMEOUT = int(getenv("PING_TIMEOUT", 5))
+PING_HISTORY = int(getenv("PING_HISTORY", 20))
+PING_DOWN_AFTER = int(getenv("PING_DOWN_AFTER", 3))
+
 
 # Get this credentials from https://developer.spotify.com/dashboard
 SPOTIFY_CLIENT_ID = getenv("SPOTIFY_CLIENT_ID", "95f4f5c6df5744698035a0948e801ad9")
@@ -72,21 +93,76 @@ TG_AUDIO_FILESIZE_LIMIT = int(getenv("TG_AUDIO_FILESIZE_LIMIT", 104857600))
 TG_VIDEO_FILESIZE_LIMIT = int(getenv("TG_VIDEO_FILESIZE_LIMIT", 1073741824))
 # Checkout https://www.gbmb.org/mb-to-bytes for converting mb to bytes
 
+# Disk budget (in bytes) for cached media in downloads/, least recently used files are evicted first
+MEDIA_CACHE_SIZE_LIMIT = int(getenv("MEDIA_CACHE_SIZE_LIMIT", 5368709120))
+
+# Disk budget (in bytes) for rendered now-playing thumbnails in cache/thumbs/
+THUMB_CACHE_SIZE_LIMIT = int(getenv("THUMB_CACHE_SIZE_LIMIT", 524288000))
+# Thumbnail render worker processes, max renders waiting for a worker and per-render timeout (seconds)
+THUMB_WORKERS = int(getenv("THUMB_WORKERS", 2))
+THUMB_QUEUE_SIZE = int(getenv("THUMB_QUEUE_SIZE", 8))
+THUMB_RENDER_TIMEOUT = int(getenv("THUMB_RENDER_TIMEOUT", 15))
+# Output of rendered thumbnails: JPEG, WEBP or PNG, and the JPEG/WEBP quality (1-100)
+THUMB_FORMAT = str(getenv("THUMB_FORMAT", "JPEG")).upper()
+THUMB_QUALITY = int(getenv("THUMB_QUALITY", 85))
+
+# Start playing replied Telegram media after TG_STREAM_PREBUFFER bytes instead of waiting for the full download
+TG_STREAM_MODE = str(getenv("TG_STREAM_MODE", "True")).lower() == "true"
+TG_STREAM_PREBUFFER = int(getenv("TG_STREAM_PREBUFFER", 4194304))
+# Local port of the loopback relay feeding ffmpeg, 0 picks a free port
+TG_STREAM_PORT = int(getenv("TG_STREAM_PORT", 0))
+
+# Speed changes: "realtime" applies atempo/setpts while streaming, "transcode" re-encodes the file into playback/ first
+SPEED_MODE = getenv("SPEED_MODE", "realtime").lower()
+# Disk budget (in bytes) for transcoded speed variants in playback/, and how many speed
+# changes on the same track trigger pre-rendering of the common speeds in the background
+SPEED_CACHE_SIZE_LIMIT = int(getenv("SPEED_CACHE_SIZE_LIMIT", 2147483648))
+SPEED_PRERENDER_AFTER = int(getenv("SPEED_PRERENDER_AFTER", 2))
+
+# Prepare the next queued track (download, ffprobe, thumbnail) PREARM_SECONDS before the current one ends
+GAPLESS_MODE = str(getenv("GAPLESS_MODE", "True")).lower() == "true"
+PREARM_SECONDS = int(getenv("PREARM_SECONDS", 20))
+
+# Live player messages: refresh every PLAYER_UPDATE_INTERVAL seconds, at most PLAYER_UPDATE_RATE edits per second
+# over all chats, and only the newest PLAYER_UPDATE_VIEWS /player views of a chat keep updating
+PLAYER_UPDATE_INTERVAL = int(getenv("PLAYER_UPDATE_INTERVAL", 7))
+PLAYER_UPDATE_RATE = float(getenv("PLAYER_UPDATE_RATE", 20))
+PLAYER_UPDATE_VIEWS = int(getenv("PLAYER_UPDATE_VIEWS", 1))
+
+# Per-chat runtime state (admin lists, votes, settings caches) is forgotten after STATE_TTL idle seconds,
+# and each such cache holds at most STATE_MAX_CHATS chats
+STATE_TTL = int(getenv("STATE_TTL", 21600))
+STATE_MAX_CHATS = int(getenv("STATE_MAX_CHATS", 5000))
+
+# Queue snapshots: written to SNAPSHOT_PATH every SNAPSHOT_INTERVAL seconds and on shutdown. On startup the chats
+# of a snapshot younger than RESTORE_MAX_AGE seconds are rejoined where they left off, RESTORE_CONCURRENCY at a time.
+# Keep SNAPSHOT_PATH out of cache/ and downloads/, which /restart wipes
+RESTORE_QUEUES = str(getenv("RESTORE_QUEUES", "True")).lower() == "true"
+SNAPSHOT_PATH = getenv("SNAPSHOT_PATH", "state/queue_snapshot.json")
+SNAPSHOT_INTERVAL = int(getenv("SNAPSHOT_INTERVAL", 30))
+RESTORE_MAX_AGE = int(getenv("RESTORE_MAX_AGE", 900))
+RESTORE_CONCURRENCY = int(getenv("RESTORE_CONCURRENCY", 3))
+
 
 # Get your pyrogram v2 session from @StringFatherBot on Telegram
-STRING1 = getenv("STRING_SESSION", None)
-STRING2 = getenv("STRING_SESSION2", None)
-STRING3 = getenv("STRING_SESSION3", None)
-STRING4 = getenv("STRING_SESSION4", None)
-STRING5 = getenv("STRING_SESSION5", None)
+# Assistant 1 reads STRING_SESSION, assistant N reads STRING_SESSIONN (STRING_SESSION2, ...).
+# STRING_SESSIONS takes extra space-separated sessions, numbered from EXTRA_SESSION_BASE + 1 by
+# position so they never shift when numbered ones come and go; "-" keeps a retired slot.
+# Chats remember their assistant by number: keep every session on the same number.
+EXTRA_SESSION_BASE = 100
+_session_numbers = [int(m.group(1)) for k in environ if (m := re.fullmatch(r"STRING_SESSION(\d+)", k))]
+STRING_SESSIONS = {1: getenv("STRING_SESSION", None)}
+STRING_SESSIONS.update(
+    (n, getenv(f"STRING_SESSION{n}", None)) for n in _session_numbers if 1 < n <= EXTRA_SESSION_BASE
+)
+STRING_SESSIONS.update(
+    (EXTRA_SESSION_BASE + i, session)
+    for i, session in enumerate(getenv("STRING_SESSIONS", "").split(), start=1)
+    if session != "-"
+)
 
 
 BANNED_USERS = filters.user()
-adminlist = {}
-lyrical = {}
-votemode = {}
-autoclean = []
-confirmer = {}
 
 
 START_IMG_URL = getenv(
@@ -0,0 +1,78 @@
+"""Helpers for testing modules of the bot without starting it.
+
+``DeadlineTech/__init__`` connects the clients as soon as it is imported, so the
+tests load single module files and hand them fakes for what they import.
+"""
+
+import importlib.util
+import os
+import sys
+import types
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def fake_module(name: str, **attrs) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__path__ = []
+    module.__dict__.update(attrs)
+    return module
+
+
+@pytest.fixture
+def load(monkeypatch):
+    """``load(path, fakes)`` imports the repo file ``path`` as its dotted module name.
+
+    ``fakes`` maps module names to modules (or attribute dicts) standing in for
+    them while the file is loaded and run; missing parent packages are faked too.
+    """
+
+    def _install(name, module):
+        parent = name.rpartition(".")[0]
+        if parent and parent not in sys.modules:
+            _install(parent, fake_module(parent))
+        monkeypatch.setitem(sys.modules, name, module)
+
+    def _load(path: str, fakes=None):
+        for name, module in (fakes or {}).items():
+            if isinstance(module, dict):
+                module = fake_module(name, **module)
+            _install(name, module)
+        name = os.path.splitext(path)[0].replace("/", ".")
+        spec = importlib.util.spec_from_file_location(name, os.path.join(ROOT, path))
+        module = importlib.util.module_from_spec(spec)
+        _install(name, module)
+        spec.loader.exec_module(module)
+        return module
+
+    return _load
+
+
+class FakeFilter:
+    """Stands in for pyrogram filters: combinable, never matched."""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __and__(self, other):
+        return self
+
+    __or__ = __rand__ = __ror__ = __and__
+
+    def __invert__(self):
+        return self
+
+
+@pytest.fixture
+def config(load, monkeypatch):
+    """The repository's config.py, loaded with the environment in ``monkeypatch``."""
+    monkeypatch.setenv("LOGGER_ID", "-1001")
+    return load(
+        "config.py",
+        {
+            "dotenv": {"load_dotenv": lambda *a, **k: None},
+            "pyrogram": {"filters": fake_module("pyrogram.filters", user=FakeFilter, command=FakeFilter)},
+        },
+    )
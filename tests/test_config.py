@@ -0,0 +1,13 @@
+def test_extra_sessions_keep_their_numbers(monkeypatch, request):
+    monkeypatch.setenv("STRING_SESSION", "one")
+    monkeypatch.setenv("STRING_SESSIONS", "extra1 extra2")
+    config = request.getfixturevalue("config")
+    assert config.STRING_SESSIONS == {1: "one", 101: "extra1", 102: "extra2"}
+
+
+def test_numbered_sessions_do_not_shift_extras(monkeypatch, request):
+    monkeypatch.setenv("STRING_SESSION", "one")
+    monkeypatch.setenv("STRING_SESSION3", "three")
+    monkeypatch.setenv("STRING_SESSIONS", "- extra2")
+    config = request.getfixturevalue("config")
+    assert config.STRING_SESSIONS == {1: "one", 3: "three", 102: "extra2"}
@@ -0,0 +1,113 @@
+import asyncio
+import os
+
+import pytest
+
+
+class FakeYoutubeDL:
+    """Downloads a webm, then converts it to mp3 the way FFmpegExtractAudio does."""
+
+    size = 100_000
+
+    def __init__(self, opts):
+        self.opts = opts
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def extract_info(self, url, download=True):
+        video_id = url.rsplit("=", 1)[-1]
+        return {"id": video_id, "ext": "webm", "duration": 3 * 3600 if "mix" in url else 180}
+
+    def prepare_filename(self, info):
+        return f"downloads/{info['id']}.{info['ext']}"
+
+    def process_ie_result(self, info, download=True):
+        if info["id"] == "forbidden":
+            raise Exception("ERROR: unable to download video data: HTTP Error 403: Forbidden")
+        source = self.prepare_filename(info)
+        with open(source, "wb") as f:
+            f.write(b"\0" * self.size)
+        for pp in self.opts.get("postprocessors", ()):
+            if pp["key"] == "FFmpegExtractAudio":
+                target = f"downloads/{info['id']}.{pp['preferredcodec']}"
+                os.replace(source, target)
+                source = target
+        return dict(info, requested_downloads=[{"filepath": source}])
+
+
+class FakeCookiePool:
+    def __init__(self):
+        self.acquired = 0
+        self.reports = []
+
+    def acquire(self):
+        self.acquired += 1
+        return "cookies/a.txt"
+
+    def report(self, cookiefile, ok, *args, **kwargs):
+        self.reports.append((cookiefile, ok))
+
+
+class FakeMediaCache:
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def put(self, key, path, kind, **meta):
+        entry = self.entries[key] = dict(meta, key=key, path=path, kind=kind)
+        return entry
+
+
+@pytest.fixture
+def downloader(load, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    cookies = FakeCookiePool()
+    module = load(
+        "DeadlineTech/utils/downloader.py",
+        {
+            "aiofiles": {},
+            "httpx": {"AsyncClient": None},
+            "yt_dlp": {"YoutubeDL": FakeYoutubeDL},
+            "config": {"API_BASE_URL": None, "DURATION_LIMIT": 3600},
+            "DeadlineTech.utils.cookies": {"cookie_pool": cookies},
+            "DeadlineTech.utils.media_cache": {"media_cache": FakeMediaCache()},
+            "DeadlineTech.utils.progress": {"ProgressReporter": None},
+        },
+    )
+    module.cookies = cookies
+    return module
+
+
+def test_audio_fallback_returns_the_postprocessed_file(downloader):
+    path = asyncio.run(downloader.download_audio("https://www.youtube.com/watch?v=abc"))
+    assert path == "downloads/abc.mp3"
+    assert os.path.exists(path)
+    assert not os.path.exists("downloads/abc.webm")
+    assert downloader.media_cache.get("audio:abc")["path"] == path
+    assert downloader.cookies.reports == [("cookies/a.txt", True)]
+
+
+def test_cookie_is_not_reported_healthy_when_the_download_fails(downloader):
+    assert asyncio.run(downloader.download_audio("https://www.youtube.com/watch?v=forbidden")) is None
+    assert downloader.cookies.reports == [("cookies/a.txt", False)]
+
+
+def test_truncated_download_is_discarded(downloader, monkeypatch):
+    monkeypatch.setattr(FakeYoutubeDL, "size", downloader.MIN_FILE_SIZE - 1)
+    assert asyncio.run(downloader.download_audio("https://www.youtube.com/watch?v=abc")) is None
+    assert not os.path.exists("downloads/abc.mp3")
+
+
+def test_soundcloud_track_over_the_limit_is_not_downloaded(downloader):
+    entry = asyncio.run(downloader.download_soundcloud("https://soundcloud.com/dj/set?id=mix"))
+    assert entry["path"] is None
+    assert entry["meta"]["duration"] == 3 * 3600
+    assert not os.listdir("downloads")
+    # SoundCloud never takes a YouTube cookie out of the pool
+    assert not downloader.cookies.acquired
@@ -0,0 +1,58 @@
+import asyncio
+
+import pytest
+
+
+class FakeCall:
+    def __init__(self):
+        self.started = []
+
+    def track_started(self, chat_id, played=0):
+        self.started.append(chat_id)
+
+
+@pytest.fixture
+def queue(load):
+    core = load("DeadlineTech/core/queue.py")
+    call = FakeCall()
+    module = load(
+        "DeadlineTech/utils/stream/queue.py",
+        {
+            "config": {"time_to_seconds": lambda duration: 180},
+            "DeadlineTech.core.call": {"Anony": call},
+            "DeadlineTech.misc": {"db": core.QueueStore()},
+            "DeadlineTech.utils.formatters": {"check_duration": None, "seconds_to_min": None},
+            "DeadlineTech.utils.stream.lifecycle": {"lifecycle": type("L", (), {"acquire": lambda self, f: None})()},
+        },
+    )
+    return module, call
+
+
+def _put(module, chat_id, file, forceplay=None):
+    return module.put_queue(chat_id, chat_id, file, "song", "03:00", "user", "vid", 1, "audio", forceplay=forceplay)
+
+
+def test_first_track_of_a_fresh_chat_starts_its_clock(queue):
+    module, call = queue
+    # stream.py joins the call with an empty queue, then queues the track
+    module.db[-100] = []
+    asyncio.run(_put(module, -100, "downloads/a.mp3"))
+    assert call.started == [-100]
+    assert module.db[-100][0]["played"] == 0
+
+
+def test_tracks_queued_behind_the_head_do_not_restart_it(queue):
+    module, call = queue
+    module.db[-100] = []
+    asyncio.run(_put(module, -100, "downloads/a.mp3"))
+    asyncio.run(_put(module, -100, "downloads/b.mp3"))
+    assert call.started == [-100]
+
+
+def test_forceplay_starts_the_new_head(queue):
+    module, call = queue
+    module.db[-100] = []
+    asyncio.run(_put(module, -100, "downloads/a.mp3"))
+    asyncio.run(_put(module, -100, "downloads/b.mp3", forceplay=True))
+    assert call.started == [-100, -100]
+    assert module.db[-100][0]["file"] == "downloads/b.mp3"
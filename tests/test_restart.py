@@ -0,0 +1,86 @@
+import asyncio
+import json
+import os
+
+from conftest import FakeFilter, fake_module
+
+
+class FakeMessage:
+    async def reply_text(self, *args, **kwargs):
+        return self
+
+    async def edit_text(self, *args, **kwargs):
+        return self
+
+
+def test_restart_keeps_the_queue_snapshot(load, config, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    for name in ("downloads", "raw_files", "cache"):
+        os.mkdir(name)
+    monkeypatch.setattr(os, "system", lambda cmd: 0)
+
+    core = load("DeadlineTech/core/queue.py")
+    db = core.QueueStore()
+    db[-100] = [core.QueueEntry(title="Song", file="vid_abc", vidid="abc", seconds=180, played=42)]
+    active = {-100}
+
+    async def get_active_chats():
+        return list(active)
+
+    async def remove_active_chat(chat_id):
+        active.discard(chat_id)
+
+    async def is_active_chat(chat_id):
+        return chat_id in active
+
+    async def nothing(*args):
+        return None
+
+    database = {
+        "get_active_chats": get_active_chats,
+        "remove_active_chat": remove_active_chat,
+        "remove_active_video_chat": nothing,
+        "is_active_chat": is_active_chat,
+        "is_active_video_chat": nothing,
+        "is_music_playing": is_active_chat,
+        "get_loop": nothing,
+        "get_lang": nothing,
+        "set_loop": nothing,
+        "music_off": nothing,
+    }
+    app = fake_module("app", on_message=lambda *a: lambda func: func, mention="bot")
+
+    async def send_message(*args, **kwargs):
+        return None
+
+    app.send_message = send_message
+    load(
+        "DeadlineTech/core/snapshot.py",
+        {
+            "DeadlineTech.core.call": {"Anony": None, "_card_photo": None, "_clear_": None, "speed_filters": None},
+            "DeadlineTech.misc": {"db": db},
+            "DeadlineTech.utils.database": database,
+            "DeadlineTech.utils.stream.lifecycle": {"lifecycle": None},
+            "DeadlineTech.logging": {"LOGGER": None},
+        },
+    )
+    restart = load(
+        "DeadlineTech/plugins/sudo/restart.py",
+        {
+            "urllib3": {"disable_warnings": lambda *a: None, "exceptions": fake_module("e", InsecureRequestWarning=None)},
+            "git": {"Repo": None},
+            "git.exc": {"GitCommandError": Exception, "InvalidGitRepositoryError": Exception},
+            "pyrogram": {"filters": fake_module("pyrogram.filters", command=FakeFilter)},
+            "DeadlineTech": {"app": app},
+            "DeadlineTech.misc": {"HAPP": None, "SUDOERS": FakeFilter(), "XCB": None, "db": db},
+            "DeadlineTech.utils.decorators.language": {"language": lambda func: func},
+            "DeadlineTech.utils.pastebin": {"AnonyBin": None},
+        },
+    )
+
+    asyncio.run(restart.restart_(None, FakeMessage()))
+
+    assert not active
+    with open(config.SNAPSHOT_PATH) as f:
+        saved = json.load(f)
+    assert saved["chats"]["-100"]["queue"][0]["file"] == "vid_abc"
@@ -0,0 +1,33 @@
+# Entry module of the thumbnail workers and the benchmarks. It sits outside the
+# DeadlineTech package so the renderer can be used without running
+# DeadlineTech/__init__ (which starts the clients): the forkserver preloads this
+# module, and workers unpickle render_thumb from here rather than from the package.
+
+import importlib.util
+import os
+import sys
+
+RENDERER = "DeadlineTech.utils.thumb_render"
+RENDERER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "DeadlineTech", "utils", "thumb_render.py")
+
+_renderer = None
+
+
+def load_renderer():
+    """The renderer module: the package's own once DeadlineTech is imported, else loaded from its file."""
+    global _renderer
+    if _renderer is None:
+        _renderer = sys.modules.get(RENDERER)
+    if _renderer is None:
+        spec = importlib.util.spec_from_file_location("thumb_render", RENDERER_PATH)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _renderer = module
+    return _renderer
+
+
+def render_thumb(*args):
+    return load_renderer().render_thumb(*args)
+
+
+load_renderer()